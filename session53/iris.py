@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
-from scipy import stats
+
+from outlier_cleaner import OutlierCleaner
 
 # 1. Data Collection (The Shopping Trip)
 url = 'https://raw.githubusercontent.com/mwaskom/seaborn-data/master/iris.csv'
@@ -10,12 +11,12 @@ data = pd.read_csv(url)
 print(data.head())
 
 # 2. Kitchen Prep: Remove Duplicates
-data = data.drop_duplicates()
-
 # 3. Kitchen Prep: Handle Outliers (using a statistical method)
-numeric_data = data.select_dtypes(include=[np.number])
-z_scores = np.abs(stats.zscore(numeric_data))
-data = data[(z_scores < 3).all(axis=1)]
+# Any row with a z-score of 3 or more in a numeric column is dropped,
+# scored after the duplicates are gone
+cleaner = OutlierCleaner(method='zscore', threshold=3)
+data, outliers = cleaner.clean_frame(data)
+print(f"Removed {cleaner.duplicates_} duplicate rows and {cleaner.outliers_} outlier rows.")
 
 # 4. Kitchen Prep: Normalize Data (Cut to the same size)
 numeric_cols = data.select_dtypes(include=[np.number]).columns
@@ -0,0 +1,307 @@
+import numpy as np
+import pandas as pd
+import argparse
+
+# --- Chunked duplicate and outlier removal ---
+# The cleaning from z_score.py / iris.py (drop exact duplicates, then drop
+# rows whose z-score is 3 or more) done in two streaming passes, so it also
+# works on files that do not fit in memory:
+#   1. fit:   the per-column statistics are accumulated chunk by chunk
+#   2. clean: each chunk is deduplicated and filtered with those statistics
+# The statistics are mergeable, so partial results (e.g. one per file or
+# per worker) can be combined.
+
+METHODS = ['zscore', 'mad']
+# Scales the MAD so it estimates the standard deviation of normal data
+MAD_SCALE = 1.4826
+
+
+class RunningStats:
+    """Per-column count, mean and variance, updated one chunk at a time (Welford / Chan). NaNs are ignored."""
+
+    def __init__(self, n_columns):
+        self.count = np.zeros(n_columns, dtype='int64')
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+
+    def _combine(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.mean = np.where(total > 0, self.mean + delta * count / total, 0.0)
+            self.m2 = np.where(total > 0, self.m2 + m2 + delta ** 2 * self.count * count / total, 0.0)
+        self.count = total
+        return self
+
+    def update(self, values):
+        """Adds a 2-D array of values (rows x columns)."""
+        values = np.asarray(values, dtype='float64')
+        count = (~np.isnan(values)).sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, np.nansum(values, axis=0) / np.maximum(count, 1), 0.0)
+        m2 = np.nansum((values - mean) ** 2, axis=0)
+        return self._combine(count, mean, m2)
+
+    def merge(self, other):
+        """Adds the statistics of another RunningStats over the same columns."""
+        return self._combine(other.count, other.mean, other.m2)
+
+    def std(self):
+        """Population standard deviation (ddof=0, like scipy.stats.zscore)."""
+        return np.sqrt(self.m2 / np.maximum(self.count, 1))
+
+
+class MedianSketch:
+    """
+    Mergeable histogram of one column's values rounded to a fixed
+    resolution, for the median and the median absolute deviation (MAD).
+    Memory grows with the number of distinct rounded values, not with the
+    number of rows; both results are exact when every value is a multiple
+    of the resolution.
+    """
+
+    def __init__(self, resolution=1e-3):
+        self.resolution = resolution
+        self.counts = pd.Series(dtype='int64')
+
+    def update(self, values):
+        """Adds a chunk of values. NaNs are ignored."""
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        keys, counts = np.unique(np.round(values / self.resolution).astype('int64'), return_counts=True)
+        self.counts = self.counts.add(pd.Series(counts, index=keys), fill_value=0).astype('int64')
+        return self
+
+    def merge(self, other):
+        """Adds the counts of another sketch built with the same resolution."""
+        if other.resolution != self.resolution:
+            raise ValueError("Can only merge sketches with the same resolution.")
+        self.counts = self.counts.add(other.counts, fill_value=0).astype('int64')
+        return self
+
+    def median(self):
+        counts = self.counts.sort_index()
+        return _weighted_median(counts.index.to_numpy() * self.resolution, counts.to_numpy())
+
+    def mad(self):
+        """Median absolute deviation from the median (unscaled)."""
+        counts = self.counts.sort_index()
+        deviations = np.abs(counts.index.to_numpy() * self.resolution - self.median())
+        order = np.argsort(deviations, kind='stable')
+        return _weighted_median(deviations[order], counts.to_numpy()[order])
+
+
+def _weighted_median(sorted_values, counts):
+    """Median of sorted_values repeated counts times, interpolated like pandas."""
+    total = counts.sum()
+    if total == 0:
+        return np.nan
+    cumulative = np.cumsum(counts)
+    position = 0.5 * (total - 1)
+    lower_rank, upper_rank = int(np.floor(position)), int(np.ceil(position))
+    lower = sorted_values[np.searchsorted(cumulative, lower_rank, side='right')]
+    upper = sorted_values[np.searchsorted(cumulative, upper_rank, side='right')]
+    return lower + (upper - lower) * (position - lower_rank)
+
+
+class FingerprintSet:
+    """
+    Set of 64-bit row fingerprints, kept as a few sorted arrays that are
+    merged as they grow (8 bytes per distinct row, and no Python object per
+    row). Two different rows only collide with probability ~2**-64.
+    """
+
+    def __init__(self):
+        self.runs = []
+
+    def __len__(self):
+        return sum(len(run) for run in self.runs)
+
+    def contains(self, fingerprints):
+        """Boolean array: which of the fingerprints are already in the set."""
+        found = np.zeros(len(fingerprints), dtype=bool)
+        for run in self.runs:
+            positions = np.minimum(np.searchsorted(run, fingerprints), len(run) - 1)
+            found |= run[positions] == fingerprints
+        return found
+
+    def add(self, fingerprints):
+        """Adds fingerprints that are not in the set yet (and are unique among themselves)."""
+        run = np.sort(np.asarray(fingerprints, dtype='uint64'))
+        if len(run) == 0:
+            return self
+        # Merge with the newest runs while they are not bigger, so there are only O(log n) runs
+        while self.runs and len(self.runs[-1]) <= len(run):
+            run = np.sort(np.concatenate([self.runs.pop(), run]), kind='stable')
+        self.runs.append(run)
+        return self
+
+
+def row_fingerprints(chunk):
+    """One 64-bit hash per row over all column values (the index is ignored)."""
+    numeric_columns = chunk.select_dtypes(include=[np.number]).columns
+    if len(numeric_columns):
+        # Hashes depend on the dtype, and read_csv gives a column int64 in one
+        # chunk and float64 in a chunk with a missing value, so all numbers
+        # are hashed as float64. Adding 0.0 turns -0.0 into 0.0, which also
+        # hash differently but are equal for drop_duplicates.
+        chunk = chunk.assign(**{column: chunk[column].astype('float64') + 0.0 for column in numeric_columns})
+    return pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+
+
+class OutlierCleaner:
+    """
+    Removes exact duplicate rows and outlier rows from a stream of DataFrame
+    chunks.
+
+    method='zscore' scores each value as |x - mean| / std, like
+    scipy.stats.zscore; method='mad' uses the robust |x - median| /
+    (1.4826 * MAD), which a few huge values cannot inflate. A row is an
+    outlier when any of its scores is >= threshold. Missing values, and
+    columns with zero spread, never make a row an outlier.
+
+    With drop_duplicates=True, duplicates are removed before the statistics
+    are computed, so they match the in-memory drop_duplicates() + zscore.
+    """
+
+    def __init__(self, columns=None, method='zscore', threshold=3.0, drop_duplicates=True, resolution=1e-3):
+        if method not in METHODS:
+            raise ValueError(f"Unknown method '{method}'. Use one of {METHODS}.")
+        self.columns = columns
+        self.method = method
+        self.threshold = threshold
+        self.drop_duplicates = drop_duplicates
+        self.resolution = resolution
+        self.center_ = None
+        self.scale_ = None
+
+    def _deduplicate(self, chunk, seen):
+        """Drops rows seen earlier in the stream or earlier in this chunk, and records the new ones."""
+        fingerprints = row_fingerprints(chunk)
+        new = ~seen.contains(fingerprints) & ~pd.Series(fingerprints).duplicated().to_numpy()
+        seen.add(fingerprints[new])
+        return chunk[new]
+
+    def _start_stats(self, chunk):
+        if self.columns is None:
+            self.columns = list(chunk.select_dtypes(include=[np.number]).columns)
+        if self.method == 'zscore':
+            return RunningStats(len(self.columns))
+        return [MedianSketch(self.resolution) for _ in self.columns]
+
+    def fit(self, chunks):
+        """First pass: computes the center and scale of each column from an iterable of chunks."""
+        seen = FingerprintSet()
+        stats = None
+        for chunk in chunks:
+            if self.drop_duplicates:
+                chunk = self._deduplicate(chunk, seen)
+            if stats is None:
+                stats = self._start_stats(chunk)
+            values = chunk[self.columns].to_numpy(dtype='float64')
+            if self.method == 'zscore':
+                stats.update(values)
+            else:
+                for sketch, column_values in zip(stats, values.T):
+                    sketch.update(column_values)
+        if stats is None:
+            raise ValueError("No chunks to fit on.")
+        return self.set_stats(stats)
+
+    def set_stats(self, stats):
+        """Uses already accumulated (e.g. merged) statistics: a RunningStats, or one MedianSketch per column."""
+        if self.method == 'zscore':
+            self.center_, self.scale_ = stats.mean, stats.std()
+        else:
+            self.center_ = np.array([sketch.median() for sketch in stats])
+            self.scale_ = MAD_SCALE * np.array([sketch.mad() for sketch in stats])
+        return self
+
+    def scores(self, chunk):
+        """Absolute score of every value in chunk[self.columns] (NaN where it cannot be scored)."""
+        values = chunk[self.columns].to_numpy(dtype='float64')
+        scale = np.where(self.scale_ > 0, self.scale_, np.nan)
+        return np.abs(values - self.center_) / scale
+
+    def split(self, chunk):
+        """Splits a (deduplicated) chunk into (kept rows, outlier rows)."""
+        with np.errstate(invalid='ignore'):
+            is_outlier = (self.scores(chunk) >= self.threshold).any(axis=1)
+        return chunk[~is_outlier], chunk[is_outlier]
+
+    def clean(self, chunks):
+        """
+        Second pass: yields (kept rows, outlier rows) for each chunk.
+        After the loop, duplicates_ and outliers_ hold the numbers removed.
+        """
+        if self.center_ is None:
+            raise ValueError("Call fit() before clean().")
+        seen = FingerprintSet()
+        self.duplicates_ = 0
+        self.outliers_ = 0
+        for chunk in chunks:
+            if self.drop_duplicates:
+                rows_before = len(chunk)
+                chunk = self._deduplicate(chunk, seen)
+                self.duplicates_ += rows_before - len(chunk)
+            kept, outliers = self.split(chunk)
+            self.outliers_ += len(outliers)
+            yield kept, outliers
+
+    def clean_frame(self, df):
+        """In-memory version: fits on df and returns (kept rows, outlier rows)."""
+        self.fit([df])
+        kept, outliers = next(self.clean([df]))
+        return kept, outliers
+
+
+def clean_csv(input_filename, output_filename, cleaner, chunk_size=100000):
+    """
+    Reads a CSV twice in chunks (fit, then clean) and writes the kept rows
+    to output_filename. Returns the outlier rows (assumed to be few).
+
+    Duplicates are found across chunks even when a column is parsed as int
+    in one chunk and as float in another:
+
+    >>> import os, tempfile
+    >>> folder = tempfile.mkdtemp()
+    >>> input_filename, output_filename = os.path.join(folder, 'in.csv'), os.path.join(folder, 'out.csv')
+    >>> with open(input_filename, 'w') as f:
+    ...     _ = f.write('k,v\\n1,5\\n2,6\\n1,5\\n3,\\n')
+    >>> outliers = clean_csv(input_filename, output_filename, OutlierCleaner(), chunk_size=2)  # doctest: +ELLIPSIS
+    Removed 1 duplicate rows and 0 outlier rows; wrote 3 rows to '...out.csv'.
+    >>> print(open(output_filename).read())
+    k,v
+    1,5
+    2,6
+    3,
+    <BLANKLINE>
+    """
+    cleaner.fit(pd.read_csv(input_filename, chunksize=chunk_size))
+    outlier_chunks = []
+    rows_written = 0
+    for i, (kept, outliers) in enumerate(cleaner.clean(pd.read_csv(input_filename, chunksize=chunk_size))):
+        kept.to_csv(output_filename, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        rows_written += len(kept)
+        outlier_chunks.append(outliers)
+    print(f"Removed {cleaner.duplicates_} duplicate rows and {cleaner.outliers_} outlier rows; "
+          f"wrote {rows_written} rows to '{output_filename}'.")
+    return pd.concat(outlier_chunks)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Remove duplicate and outlier rows from a CSV, chunk by chunk.")
+    parser.add_argument('input', help="CSV file to clean.")
+    parser.add_argument('output', help="Where to write the cleaned CSV.")
+    parser.add_argument('--columns', nargs='+', default=None, help="Columns to score (default: all numeric).")
+    parser.add_argument('--method', choices=METHODS, default='zscore')
+    parser.add_argument('--threshold', type=float, default=3.0)
+    parser.add_argument('--keep-duplicates', action='store_true', help="Do not remove exact duplicate rows.")
+    parser.add_argument('--chunk-size', type=int, default=100000)
+    args = parser.parse_args()
+
+    cleaner = OutlierCleaner(args.columns, args.method, args.threshold, drop_duplicates=not args.keep_duplicates)
+    outliers = clean_csv(args.input, args.output, cleaner, args.chunk_size)
+    if not outliers.empty:
+        print("\n--- Removed Outlier(s) ---")
+        print(outliers)
@@ -1,6 +1,6 @@
 import pandas as pd
-from scipy import stats
-import numpy as np
+
+from outlier_cleaner import OutlierCleaner
 
 # --- Analysis on Cleaned, Preprocessed Data ---
 
@@ -14,27 +14,22 @@ except FileNotFoundError:
 # --- Step 2: Preprocessing (The "Kitchen Prep") ---
 print("--- Starting Data Cleaning Process ---")
 
-# Task 1: Remove Duplicate Rows
-# We count the rows before and after to show the effect.
-rows_before = len(df_clean)
-df_clean = df_clean.drop_duplicates()
-rows_after = len(df_clean)
-print(f"Removed {rows_before - rows_after} duplicate rows.")
-
-# Task 2: Handle Outliers
-# We identify the outlier (any sale over 1000 is suspicious) and remove it.
-# This is a simple filtering method foz_scores = np.abs(stats.zscore(df['unit_sold']))r obvious errors.
-z_scores = np.abs(stats.zscore(df_clean['unit_sold']))
+# Tasks 1 and 2: Remove Duplicate Rows and Handle Outliers
+# Duplicates are dropped first and the z-scores are computed on what is
+# left, so the outlier mask always lines up with the rows it filters.
+# (For files too big for memory, the same cleaner runs chunk by chunk:
+# python outlier_cleaner.py sales.csv sales_clean.csv)
 threshold = 3
-outliers = df_clean[z_scores > threshold]
+cleaner = OutlierCleaner(columns=['unit_sold'], method='zscore', threshold=threshold)
+df_clean, outliers = cleaner.clean_frame(df_clean)
+print(f"Removed {cleaner.duplicates_} duplicate rows.")
+
 print("\n--- Identified Outlier(s) ---")
 if not outliers.empty:
     print(outliers)
 else:
     print("No outliers found with the current threshold.")
 
-df_clean = df_clean[z_scores < threshold]
-
 # --- Step 3: Perform the analysis on the clean data ---
 print("\n--- Calculating Total Sales (After Cleaning) ---")
 # Now that the data is clean, the result will reflect the true story.
@@ -44,6 +39,6 @@ sorted = correct_sales_total.sort_index(ascending=False)
 print("Corrected Results:")
 print(sorted)
 
-print(f"\nConclusion from the clean data: {sorted[0]} is actually outperforming {sorted[1]}.")
+print(f"\nConclusion from the clean data: {sorted.index[0]} is actually outperforming {sorted.index[1]}.")
 print("(This is the TRUE story hidden in the data!)")
 
@@ -0,0 +1,173 @@
+import pandas as pd
+import numpy as np
+import argparse
+import csv
+import io
+import json
+import os
+
+from gym_features import DAYS_OF_WEEK, TIME_SESSIONS, SESSION_OF_HOUR
+
+# --- Incremental gym attendance counts ---
+# Keeps a small counts tensor (day_of_week x time_session x membership_type)
+# plus the byte offset of the last check-in already counted. Each run only
+# reads the rows appended to gym_attendance.csv since then, and the reports
+# are sums over the tensor, so history is never rescanned.
+
+STATE_FILE = 'attendance_state.json'
+# Label for check-ins without a membership type, so they still count towards the day and session totals
+MISSING_MEMBERSHIP = 'Unknown'
+
+
+class AttendanceCounts:
+    """Check-in counts by day of week, time session and membership type, updated incrementally."""
+
+    def __init__(self):
+        self.memberships = []
+        self.counts = np.zeros((len(DAYS_OF_WEEK), len(TIME_SESSIONS), 0), dtype='int64')
+        self.columns = None
+        self.offset = 0
+        self.rows = 0
+
+    def _membership_codes(self, membership_types):
+        """Codes of the membership types, adding a new counts slice for any type not seen before."""
+        membership_types = membership_types.fillna(MISSING_MEMBERSHIP).astype(str)
+        new_types = sorted(set(membership_types.unique()) - set(self.memberships))
+        if new_types:
+            self.memberships += new_types
+            extra = np.zeros(self.counts.shape[:2] + (len(new_types),), dtype='int64')
+            self.counts = np.concatenate([self.counts, extra], axis=2)
+        return pd.Categorical(membership_types, categories=self.memberships).codes.astype('int64')
+
+    def update(self, checkins):
+        """
+        Adds a DataFrame of check-ins ('check_in_timestamp' and
+        'membership_type' columns) and returns the number counted. Rows
+        whose timestamp is missing or unreadable cannot be bucketed and are
+        skipped; a missing membership type is counted as 'Unknown'.
+        """
+        timestamps = pd.to_datetime(checkins['check_in_timestamp'], errors='coerce')
+        checkins, timestamps = checkins[timestamps.notna()], timestamps[timestamps.notna()]
+        days = timestamps.dt.dayofweek.to_numpy(dtype='int64')
+        sessions = SESSION_OF_HOUR[timestamps.dt.hour.to_numpy(dtype='int64')].astype('int64')
+        memberships = self._membership_codes(checkins['membership_type'])
+
+        n_sessions, n_memberships = self.counts.shape[1:]
+        cells = (days * n_sessions + sessions) * n_memberships + memberships
+        self.counts += np.bincount(cells, minlength=self.counts.size).reshape(self.counts.shape)
+        self.rows += len(checkins)
+        return len(checkins)
+
+    def _is_complete_row(self, line):
+        """True when a CSV line has every column filled in and a readable timestamp."""
+        fields = next(csv.reader([line.decode()]), [])
+        if len(fields) != len(self.columns) or not all(field.strip() for field in fields):
+            return False
+        timestamp = fields[self.columns.index('check_in_timestamp')]
+        return not pd.isna(pd.to_datetime(timestamp, errors='coerce'))
+
+    def update_from_file(self, csv_path, wait_for_newline=False):
+        """
+        Counts the lines appended to csv_path since the last call and moves
+        the offset past them. Returns the number of new check-ins counted.
+
+        A last line without a newline is counted when it parses completely
+        (every column filled in, readable timestamp), so a finished file
+        such as the shipped gym_attendance.csv is counted in full. A writer
+        that is still mid-line can leave a prefix that happens to parse;
+        with wait_for_newline=True the last line is only counted once its
+        newline has been written. Lines that cannot be parsed are skipped
+        (the offset still moves past them). A file smaller than the saved
+        offset is treated as a new file and counted from the start.
+        """
+        if os.path.getsize(csv_path) < self.offset:
+            print(f"'{csv_path}' is smaller than the saved offset; counting it again from the start.")
+            self.__init__()
+
+        with open(csv_path, 'rb') as f:
+            if self.offset == 0:
+                header = f.readline()
+                self.columns = next(csv.reader([header.decode()]))
+                self.offset = len(header)
+            f.seek(self.offset)
+            data = f.read()
+
+        complete = data[:data.rfind(b'\n') + 1]
+        last_line = data[len(complete):]
+        if last_line.strip():
+            if not wait_for_newline and self._is_complete_row(last_line):
+                complete = data
+            else:
+                print(f"Leaving {len(last_line)} bytes of an unterminated last line for the next run.")
+        if not complete.strip():
+            return 0
+
+        lines = [line for line in complete.splitlines() if line.strip()]
+        checkins = pd.read_csv(io.BytesIO(complete), names=self.columns, header=None,
+                               usecols=['check_in_timestamp', 'membership_type'], on_bad_lines='skip')
+        counted = self.update(checkins)
+        self.offset += len(complete)
+        if counted < len(lines):
+            print(f"Skipped {len(lines) - counted} lines that could not be parsed.")
+        return counted
+
+    # --- Reports, summed from the counts tensor ---
+
+    def by_day(self):
+        return pd.Series(self.counts.sum(axis=(1, 2)), index=pd.Index(DAYS_OF_WEEK, name='day_of_week'),
+                         name='count')
+
+    def by_session(self):
+        return pd.Series(self.counts.sum(axis=(0, 2)), index=pd.Index(TIME_SESSIONS, name='time_session'),
+                         name='count')
+
+    def session_by_membership(self):
+        return pd.DataFrame(self.counts.sum(axis=0), index=pd.Index(TIME_SESSIONS, name='time_session'),
+                            columns=pd.Index(self.memberships, name='membership_type'))
+
+    # --- Persistence ---
+
+    def save(self, state_path=STATE_FILE):
+        """Writes the counts and the file offset as JSON (atomically, via a temporary file)."""
+        state = {'memberships': self.memberships, 'counts': self.counts.tolist(), 'columns': self.columns,
+                 'offset': self.offset, 'rows': self.rows}
+        temp_path = state_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(temp_path, state_path)
+
+    @classmethod
+    def load(cls, state_path=STATE_FILE):
+        """Loads saved counts, or returns empty counts when there is no state file yet."""
+        aggregator = cls()
+        if os.path.exists(state_path):
+            with open(state_path) as f:
+                state = json.load(f)
+            aggregator.memberships = state['memberships']
+            aggregator.counts = np.array(state['counts'], dtype='int64').reshape(
+                len(DAYS_OF_WEEK), len(TIME_SESSIONS), len(state['memberships']))
+            aggregator.columns = state['columns']
+            aggregator.offset = state['offset']
+            aggregator.rows = state['rows']
+        return aggregator
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Update the gym attendance counts with new check-ins and report.")
+    parser.add_argument('--csv', default='gym_attendance.csv', help="Check-in log that new rows are appended to.")
+    parser.add_argument('--state', default=STATE_FILE, help="Where the counts and file offset are kept.")
+    parser.add_argument('--wait-for-newline', action='store_true',
+                        help="Only count a last line once its newline is written (for files still being written to).")
+    args = parser.parse_args()
+
+    aggregator = AttendanceCounts.load(args.state)
+    new_rows = aggregator.update_from_file(args.csv, args.wait_for_newline)
+    aggregator.save(args.state)
+    print(f"Counted {new_rows} new check-ins ({aggregator.rows} in total).")
+
+    print("\nAttendance by Day of the Week:")
+    print(aggregator.by_day().sort_values(ascending=False))
+    print("\nAttendance by Time Session:")
+    print(aggregator.by_session().sort_values(ascending=False))
+    print("\n--- Peak Times by Membership Type ---")
+    print(aggregator.session_by_membership())
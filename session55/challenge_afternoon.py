@@ -1,5 +1,7 @@
 import pandas as pd
 
+from gym_features import add_time_features, count_codes, cross_count
+
 # --- 1. Data Collection & Feature Selection ---
 try:
     # Read the 'gym_attendance.csv' file into a DataFrame.
@@ -13,32 +15,16 @@ except FileNotFoundError:
 # Create a new DataFrame called 'df_selected' that only contains the
 # 'check_in_timestamp' and 'membership_type' columns.
 features_to_select = ['check_in_timestamp', 'membership_type']
-df_selected = df[features_to_select]
+df_selected = df[features_to_select].astype({'membership_type': 'category'})
 
 
 # --- 2. Feature Engineering (The Creative Part) ---
-# Convert the 'check_in_timestamp' column to a datetime object first.
-df_selected['check_in_timestamp'] = pd.to_datetime(df_selected['check_in_timestamp'])
-
-# Create a new 'day_of_week' column.
-# Use the .dt.day_name() attribute on the timestamp column.
-df_selected['day_of_week'] = df_selected['check_in_timestamp'].dt.day_name()
-
-# Create a new 'hour_of_day' column to help with the next step.
-# Use the .dt.hour attribute.
-df_selected['hour_of_day'] = df_selected['check_in_timestamp'].dt.hour
-
-# Create the 'time_session' column using a helper function and .apply().
-def get_session(hour):
-  """Categorizes an hour into a time session."""
-  if 5 <= hour < 12:
-    return 'Morning'
-  elif 12 <= hour < 17:
-    return 'Afternoon'
-  else:
-    return 'Night'
-
-df_selected['time_session'] = df_selected['hour_of_day'].apply(get_session)
+# add_time_features returns a new DataFrame (not a view of df) with:
+# - 'check_in_timestamp' converted to a datetime,
+# - 'day_of_week' (Monday ... Sunday) and 'hour_of_day',
+# - 'time_session' (Morning 5-11, Afternoon 12-16, Night otherwise), looked up
+#   for all rows at once in a 24-entry hour -> session table.
+df_selected = add_time_features(df_selected)
 
 print("--- Data After Feature Engineering ---")
 print(df_selected.head())
@@ -47,13 +33,13 @@ print(df_selected.head())
 # --- 3. Analysis with GroupBy ---
 print("\n--- Gym Attendance Analysis ---")
 # Find the busiest day of the week.
-# .value_counts() is a convenient way to group by a category and count the occurrences.
-busiest_day = df_selected['day_of_week'].value_counts()
+# The day is a categorical, so counting is a single bincount over its integer codes.
+busiest_day = count_codes(df_selected['day_of_week']).sort_values(ascending=False)
 print("\nAttendance by Day of the Week:")
 print(busiest_day)
 
 # Find the most popular time session.
-busiest_session = df_selected['time_session'].value_counts()
+busiest_session = count_codes(df_selected['time_session']).sort_values(ascending=False)
 print("\nAttendance by Time Session:")
 print(busiest_session)
 
@@ -62,11 +48,9 @@ print(busiest_session)
 print("\n--- Peak Times by Membership Type ---")
 # Create a pivot table to see how many check-ins each membership type
 # has during each time session.
-# We use 'day_of_week' as the value to count, but any column would work.
-pivot = df_selected.pivot_table(index='time_session', columns='membership_type', values='day_of_week', aggfunc='count')
-
-# Fill any missing combinations with 0 for better readability
-pivot = pivot.fillna(0)
+# Counted from the session and membership codes; combinations with no
+# check-ins are already 0.
+pivot = cross_count(df_selected['time_session'], df_selected['membership_type'])
 
 print(pivot)
 
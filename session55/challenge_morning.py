@@ -26,7 +26,7 @@ customer_df = pd.DataFrame(customer_data)
 print("--- SOLUTION FOR TASK 1 ---")
 # Calculate the median and fill missing values
 median_score = customer_df['satisfaction_score'].median()
-customer_df['satisfaction_score'].fillna(median_score, inplace=True)
+customer_df['satisfaction_score'] = customer_df['satisfaction_score'].fillna(median_score)
 
 # Group by region and aggregate
 regional_report = customer_df.groupby('region').agg(
@@ -39,23 +39,37 @@ print("\n" + "="*50 + "\n")
 
 # --- Task 2: Advanced Purchase Analysis (Feature Engineering) ---
 print("--- SOLUTION FOR TASK 2 ---")
+# The date the analysis is run, parsed once
+ANALYSIS_DATE = pd.Timestamp('2025-07-30')
+
 # Define a function to parse the messy column
-def parse_purchase_details(detail_string):
-    if pd.isna(detail_string):
-        return pd.NA, pd.NA
-    
-    date_str, amount_str = detail_string.split(':$')
-    amount = float(amount_str)
-    
-    analysis_date = pd.to_datetime('2025-07-30')
-    purchase_date = pd.to_datetime(date_str)
-    days_since = (analysis_date - purchase_date).days
-    
-    return days_since, amount
-
-# Apply the function and create two new columns
-customer_df[['days_since_last_purchase', 'last_purchase_amount']] = customer_df['last_purchase_details'].apply(
-    lambda x: pd.Series(parse_purchase_details(x))
+def parse_purchase_details(details, analysis_date=ANALYSIS_DATE):
+    """
+    Splits 'YYYY-MM-DD:$amount' strings into days since the purchase and the
+    purchase amount, for the whole column at once. Like splitting on ':$'
+    row by row, it accepts dates such as '2025-7-1' and negative amounts;
+    missing or malformed details (including impossible dates) give NaN in
+    both columns.
+    """
+    # 'string' dtype also handles a column that is entirely missing (float NaN)
+    details = details.astype('string')
+    has_separator = details.str.contains(':$', regex=False, na=False)
+    # Vectorized regex replaces cut out the two parts (much faster than str.extract or split(expand=True))
+    date_part = details.str.replace(r':\$.*$', '', regex=True).where(has_separator)
+    amount_part = details.str.replace(r'^.*?:\$', '', regex=True).str.strip()
+    purchase_date = pd.to_datetime(date_part, format='ISO8601', errors='coerce')
+    is_number = amount_part.str.fullmatch(r'[-+]?(\d+\.?\d*|\.\d+)', na=False)
+    amount = amount_part.where(has_separator & is_number).astype('float64')
+
+    valid = purchase_date.notna() & amount.notna()
+    return pd.DataFrame({
+        'days_since_last_purchase': (analysis_date - purchase_date).dt.days.where(valid).astype('float64'),
+        'last_purchase_amount': amount.where(valid),
+    }, index=details.index)
+
+# Parse the column in one vectorized pass and create two new columns
+customer_df[['days_since_last_purchase', 'last_purchase_amount']] = parse_purchase_details(
+    customer_df['last_purchase_details']
 )
 print("DataFrame with new engineered features (days_since_last_purchase, last_purchase_amount):")
 print(customer_df[['customer_id', 'days_since_last_purchase', 'last_purchase_amount']].head())
@@ -72,8 +86,8 @@ features_to_select = [
 model_df = customer_df[features_to_select].copy()
 
 # Handle missing values in the selected data before encoding/modeling
-model_df['days_since_last_purchase'].fillna(model_df['days_since_last_purchase'].median(), inplace=True)
-model_df['last_purchase_amount'].fillna(model_df['last_purchase_amount'].median(), inplace=True)
+model_df['days_since_last_purchase'] = model_df['days_since_last_purchase'].fillna(model_df['days_since_last_purchase'].median())
+model_df['last_purchase_amount'] = model_df['last_purchase_amount'].fillna(model_df['last_purchase_amount'].median())
 
 # One-Hot Encoding
 model_df_encoded = pd.get_dummies(model_df, columns=['gender', 'region', 'last_device_used'], drop_first=True)
@@ -0,0 +1,63 @@
+import pandas as pd
+import numpy as np
+
+# --- Vectorized time features and counts for the gym check-in logs ---
+# Every check-in is bucketed with array lookups instead of a Python call per
+# row, and the day / session / membership columns are categoricals, so the
+# counts are np.bincount calls over their integer codes.
+
+DAYS_OF_WEEK = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+TIME_SESSIONS = ['Morning', 'Afternoon', 'Night']
+
+# Session code for each hour 0-23: Morning is 5-11, Afternoon 12-16, Night the rest
+SESSION_OF_HOUR = np.full(24, TIME_SESSIONS.index('Night'), dtype='int8')
+SESSION_OF_HOUR[5:12] = TIME_SESSIONS.index('Morning')
+SESSION_OF_HOUR[12:17] = TIME_SESSIONS.index('Afternoon')
+
+
+def time_session(hours):
+    """Categorical Morning / Afternoon / Night for an array or Series of hours (0-23); missing hours give NaN."""
+    hours = pd.to_numeric(pd.Series(hours)).to_numpy(dtype='float64', na_value=np.nan)
+    known = ~np.isnan(hours)
+    # Code -1 is a missing category
+    codes = np.full(len(hours), -1, dtype='int8')
+    codes[known] = SESSION_OF_HOUR[hours[known].astype('int64')]
+    return pd.Categorical.from_codes(codes, categories=TIME_SESSIONS)
+
+
+def add_time_features(df, timestamp_column='check_in_timestamp'):
+    """
+    Returns a copy of df with the timestamp parsed and 'day_of_week',
+    'hour_of_day' and 'time_session' columns added (day and session as
+    ordered categoricals, the hour as a nullable Int8). A missing timestamp
+    gives missing values in all three.
+    """
+    df = df.copy()
+    timestamps = pd.to_datetime(df[timestamp_column])
+    df[timestamp_column] = timestamps
+    day_codes = timestamps.dt.dayofweek.fillna(-1).to_numpy(dtype='int8')
+    df['day_of_week'] = pd.Categorical.from_codes(day_codes, categories=DAYS_OF_WEEK, ordered=True)
+    df['hour_of_day'] = timestamps.dt.hour.astype('Int8')
+    df['time_session'] = pd.Categorical(time_session(df['hour_of_day']), ordered=True)
+    return df
+
+
+def count_codes(column):
+    """Number of rows per category of a categorical column (including categories with no rows; NaN is dropped)."""
+    categories = column.cat.categories
+    codes = column.cat.codes.to_numpy()
+    return pd.Series(np.bincount(codes[codes >= 0], minlength=len(categories)),
+                     index=pd.Index(categories, name=column.name), name='count')
+
+
+def cross_count(rows, columns):
+    """Pivot table of row counts for two categorical columns, computed from their codes (rows with NaN are dropped)."""
+    n_rows, n_columns = len(rows.cat.categories), len(columns.cat.categories)
+    row_codes = rows.cat.codes.to_numpy(dtype='int64')
+    column_codes = columns.cat.codes.to_numpy(dtype='int64')
+    # Code -1 is NaN; counting it would spill into a neighbouring cell
+    known = (row_codes >= 0) & (column_codes >= 0)
+    combined = row_codes[known] * n_columns + column_codes[known]
+    counts = np.bincount(combined, minlength=n_rows * n_columns).reshape(n_rows, n_columns)
+    return pd.DataFrame(counts, index=pd.Index(rows.cat.categories, name=rows.name),
+                        columns=pd.Index(columns.cat.categories, name=columns.name))
@@ -1,14 +1,84 @@
 import pandas as pd
 
-# Define the size of each chunk (e.g., 100,000 rows)
-chunk_size = 100000
-
-# Create an iterator that reads the CSV in chunks
-data_chunks = pd.read_csv('large_transactions_dataset.csv', chunksize=chunk_size)
-
-# Loop through each chunk and process it
-for chunk in data_chunks:
-    # Perform your operations on the small chunk here
-    # For example, let's just print the number of rows in each chunk
-    print(f"Processing a chunk with {len(chunk)} rows...")
-    # cleaned_chunk = chunk.dropna() # Example operation
\ No newline at end of file
+def iter_chunks(filename, chunk_size, columns=None, skip_rows=0):
+    """
+    Returns an iterator of DataFrame chunks for a CSV, Parquet or Feather file.
+    Columnar files keep their stored types (category, int8, datetime64),
+    so no text parsing is needed. Pass columns to read only those columns,
+    and skip_rows to start after that many data rows (skipped CSV lines are
+    not parsed; whole row groups or record batches are not read at all).
+    Skipping the rows of earlier chunks gives the remaining chunks unchanged.
+    """
+    if filename.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(filename)
+        return _iter_parquet_chunks(parquet_file, chunk_size, columns, skip_rows)
+    if filename.endswith('.feather'):
+        import pyarrow as pa
+        reader = pa.ipc.open_file(pa.memory_map(filename))
+        return _iter_feather_chunks(reader, chunk_size, columns, skip_rows)
+    # Line 0 is the header, so the skipped data rows are lines 1..skip_rows
+    chunks = pd.read_csv(filename, chunksize=chunk_size, usecols=columns, skiprows=range(1, skip_rows + 1))
+    if skip_rows:
+        # When every row is skipped, read_csv still gives one empty chunk
+        return (chunk for chunk in chunks if len(chunk))
+    return chunks
+
+def _iter_parquet_chunks(parquet_file, chunk_size, columns, skip_rows):
+    import pyarrow as pa
+    first_group = 0
+    while first_group < parquet_file.num_row_groups:
+        num_rows = parquet_file.metadata.row_group(first_group).num_rows
+        if skip_rows < num_rows:
+            break
+        skip_rows -= num_rows
+        first_group += 1
+    if first_group == parquet_file.num_row_groups:
+        return
+    row_groups = range(first_group, parquet_file.num_row_groups)
+    batches = parquet_file.iter_batches(batch_size=chunk_size, row_groups=row_groups, columns=columns)
+    first_batch = next(batches)
+    while skip_rows >= first_batch.num_rows:
+        skip_rows -= first_batch.num_rows
+        first_batch = next(batches)
+    if skip_rows == 0:
+        yield first_batch.to_pandas()
+        yield from (batch.to_pandas() for batch in batches)
+        return
+    # Batches run on across row groups, so the rows after a skip in the
+    # middle of a batch are regrouped into chunk_size chunks; this keeps the
+    # chunks of a resumed read the same as when reading from the start
+    rest = pa.Table.from_batches([first_batch]).slice(skip_rows)
+    for batch in batches:
+        table = pa.concat_tables([rest, pa.Table.from_batches([batch])])
+        yield table.slice(0, chunk_size).to_pandas()
+        rest = table.slice(chunk_size)
+    for offset in range(0, rest.num_rows, chunk_size):
+        yield rest.slice(offset, chunk_size).to_pandas()
+
+def _iter_feather_chunks(reader, chunk_size, columns, skip_rows):
+    for i in range(reader.num_record_batches):
+        batch = reader.get_batch(i)
+        if skip_rows >= batch.num_rows:
+            skip_rows -= batch.num_rows
+            continue
+        if columns is not None:
+            batch = batch.select(columns)
+        for offset in range(skip_rows, batch.num_rows, chunk_size):
+            yield batch.slice(offset, chunk_size).to_pandas()
+        skip_rows = 0
+
+
+if __name__ == "__main__":
+    # Define the size of each chunk (e.g., 100,000 rows)
+    chunk_size = 100000
+
+    # Create an iterator that reads the file in chunks
+    data_chunks = iter_chunks('large_transactions_dataset.csv', chunk_size)
+
+    # Loop through each chunk and process it
+    for chunk in data_chunks:
+        # Perform your operations on the small chunk here
+        # For example, let's just print the number of rows in each chunk
+        print(f"Processing a chunk with {len(chunk)} rows...")
+        # cleaned_chunk = chunk.dropna() # Example operation
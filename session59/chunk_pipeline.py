@@ -0,0 +1,60 @@
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Marks the end of the input in the prefetch queue
+_END = object()
+
+
+def _prefetch(data_chunks, chunk_queue):
+    """Reader thread: parses chunks ahead of time and hands them over through a bounded queue."""
+    try:
+        for i, chunk in enumerate(data_chunks):
+            chunk_queue.put((i, chunk))
+    except Exception as e:
+        chunk_queue.put(e)
+        return
+    chunk_queue.put(_END)
+
+
+def run_chunk_pipeline(data_chunks, process_chunk, handle_result, workers=None, prefetch=2):
+    """
+    Runs process_chunk(chunk_index, chunk) over a chunk iterator in three stages:
+
+    1. a reader thread pulls chunks from data_chunks into a queue of size prefetch,
+    2. a process pool runs process_chunk on up to 2 x workers chunks at a time,
+    3. handle_result(result) is called in the main thread, in chunk order.
+
+    Every stage blocks when the next one falls behind, so at most
+    prefetch + 2 x workers chunks are held in memory at any time.
+    process_chunk must be a module-level function so it can be pickled.
+    """
+    workers = workers or os.cpu_count()
+    max_in_flight = workers * 2
+
+    chunk_queue = queue.Queue(maxsize=prefetch)
+    reader = threading.Thread(target=_prefetch, args=(data_chunks, chunk_queue), daemon=True)
+    reader.start()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        input_done = False
+
+        while not input_done or pending:
+            # Keep the pool busy while there is room for more chunks in flight
+            while not input_done and len(pending) < max_in_flight:
+                item = chunk_queue.get()
+                if item is _END:
+                    input_done = True
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    pending.append(executor.submit(process_chunk, *item))
+
+            if pending:
+                # Always wait for the oldest chunk so results come out in order
+                handle_result(pending.popleft().result())
+
+    reader.join()
@@ -1,65 +1,183 @@
 import pandas as pd
 import numpy as np
-import random
+import argparse
 import time
 import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
-def create_dummy_chunk(chunk_id, num_rows_per_chunk):
+PRODUCT_CATEGORIES = ['Electronics', 'Clothing', 'Groceries', 'Home Goods', 'Books', 'Toys']
+
+# File extension used for each supported output format
+FILE_EXTENSIONS = {'csv': '.csv', 'parquet': '.parquet', 'feather': '.feather'}
+
+def create_dummy_chunk(chunk_id, num_rows_per_chunk, seed=None):
     """Generates a single chunk of realistic-looking dummy data."""
     
     start_id = chunk_id * num_rows_per_chunk
     
+    # Each chunk gets its own random generator. With a seed, chunk N always
+    # produces the same rows no matter which worker process builds it.
+    rng = np.random.default_rng(None if seed is None else [seed, chunk_id])
+    
     data = {
-        'transaction_id': range(start_id, start_id + num_rows_per_chunk),
-        'user_id': np.random.randint(10000, 50000, size=num_rows_per_chunk),
-        'transaction_amount': np.random.uniform(5.0, 500.0, size=num_rows_per_chunk).round(2),
-        'product_category': np.random.choice(
-            ['Electronics', 'Clothing', 'Groceries', 'Home Goods', 'Books', 'Toys'],
+        'transaction_id': np.arange(start_id, start_id + num_rows_per_chunk),
+        'user_id': rng.integers(10000, 50000, size=num_rows_per_chunk),
+        'transaction_amount': rng.uniform(5.0, 500.0, size=num_rows_per_chunk).round(2),
+        'product_category': rng.choice(
+            PRODUCT_CATEGORIES,
             size=num_rows_per_chunk,
             p=[0.2, 0.2, 0.3, 0.15, 0.1, 0.05] # Probabilities for each category
         ),
-        'timestamp': pd.to_datetime(np.random.randint(1609459200, 1640995199, size=num_rows_per_chunk), unit='s'), # Random dates in 2021
-        'is_fraudulent': np.random.choice([0, 1], size=num_rows_per_chunk, p=[0.99, 0.01]) # 1% of transactions are fraudulent
+        'timestamp': pd.to_datetime(rng.integers(1609459200, 1640995199, size=num_rows_per_chunk), unit='s'), # Random dates in 2021
+        'is_fraudulent': rng.choice([0, 1], size=num_rows_per_chunk, p=[0.99, 0.01]) # 1% of transactions are fraudulent
     }
     
     # Introduce some missing values to make it realistic
-    df = pd.DataFrame(data)
-    for _ in range(int(num_rows_per_chunk * 0.02)): # Make 2% of rows have a missing amount
-        df.loc[random.randint(0, num_rows_per_chunk-1), 'transaction_amount'] = np.nan
+    # Make 2% of rows have a missing amount, picked in one vectorized step
+    missing_rows = rng.choice(num_rows_per_chunk, size=int(num_rows_per_chunk * 0.02), replace=False)
+    data['transaction_amount'][missing_rows] = np.nan
         
-    return df
+    return pd.DataFrame(data)
 
-def generate_large_csv(filename, total_rows, chunk_size):
-    """Generates a large CSV file by creating and appending chunks."""
-    
-    print(f"Starting to generate '{filename}' with {total_rows:,} rows...")
-    start_time = time.time()
+def to_typed_chunk(chunk):
+    """Casts a generated chunk to compact column types for columnar formats."""
+    chunk['product_category'] = pd.Categorical(chunk['product_category'], categories=PRODUCT_CATEGORIES)
+    chunk['is_fraudulent'] = chunk['is_fraudulent'].astype('int8')
+    chunk['timestamp'] = chunk['timestamp'].astype('datetime64[ns]')
+    return chunk
+
+def _build_chunk(chunk_id, num_rows_per_chunk, seed, file_format):
+    """
+    Worker task: builds one chunk. CSV chunks come back already rendered as
+    text; columnar chunks come back as a typed DataFrame.
+    """
+    chunk = create_dummy_chunk(chunk_id, num_rows_per_chunk, seed=seed)
+    if file_format == 'csv':
+        return chunk.to_csv(header=(chunk_id == 0), index=False)
+    return to_typed_chunk(chunk)
+
+class ChunkWriter:
+    """Writes chunks to a single CSV, Parquet or Feather file, one after another."""
     
-    # Ensure the file doesn't exist from a previous run
-    if os.path.exists(filename):
-        os.remove(filename)
+    def __init__(self, filename, file_format='csv'):
+        if file_format not in FILE_EXTENSIONS:
+            raise ValueError(f"Unsupported format '{file_format}'. Choose from: {', '.join(FILE_EXTENSIONS)}")
+        self.filename = filename
+        self.file_format = file_format
+        self.is_first_chunk = True
+        self._writer = None
         
-    num_chunks = total_rows // chunk_size
+        if file_format == 'csv':
+            self._file = open(filename, 'w', newline='')
+        else:
+            # pyarrow is only needed for the columnar formats
+            import pyarrow
+            self._pa = pyarrow
+            self._file = None
     
-    for i in range(num_chunks):
-        chunk = create_dummy_chunk(chunk_id=i, num_rows_per_chunk=chunk_size)
-        
-        # The first chunk writes the header, subsequent chunks append without the header
-        is_first_chunk = (i == 0)
-        chunk.to_csv(filename, mode='a', header=is_first_chunk, index=False)
-        
-        # Progress indicator
-        if (i + 1) % 10 == 0:
-            print(f"  ... {i+1}/{num_chunks} chunks written")
-            
-    end_time = time.time()
+    def write(self, chunk):
+        """Appends a chunk: CSV text, or a DataFrame which becomes one row group / record batch."""
+        if self.file_format == 'csv':
+            if not isinstance(chunk, str):
+                chunk = chunk.to_csv(header=self.is_first_chunk, index=False)
+            self._file.write(chunk)
+        else:
+            table = self._pa.Table.from_pandas(to_typed_chunk(chunk), preserve_index=False)
+            if self._writer is None:
+                self._writer = self._open_columnar_writer(table.schema)
+            self._writer.write_table(table)
+        self.is_first_chunk = False
+    
+    def _open_columnar_writer(self, schema):
+        if self.file_format == 'parquet':
+            import pyarrow.parquet as pq
+            return pq.ParquetWriter(self.filename, schema)
+        # Feather v2 is the Arrow IPC file format
+        return self._pa.ipc.new_file(self.filename, schema)
+    
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+def print_generation_summary(filename, total_rows, elapsed):
+    """Prints the file size together with rows/sec and MB/sec throughput."""
     file_size = os.path.getsize(filename) / (1024 * 1024) # in MB
     
     print("\n--- Generation Complete! ---")
     print(f"File '{filename}' created successfully.")
     print(f"Total rows: {total_rows:,}")
     print(f"File size: {file_size:.2f} MB")
-    print(f"Time taken: {end_time - start_time:.2f} seconds")
+    print(f"Time taken: {elapsed:.2f} seconds")
+    print(f"Throughput: {total_rows / elapsed:,.0f} rows/sec, {file_size / elapsed:.2f} MB/sec")
+
+def generate_large_csv(filename, total_rows, chunk_size, seed=None, file_format='csv'):
+    """
+    Generates a large dataset file by creating and appending chunks.
+    Despite the name, file_format can also be 'parquet' or 'feather'.
+    """
+    
+    print(f"Starting to generate '{filename}' ({file_format}) with {total_rows:,} rows...")
+    start_time = time.time()
+        
+    num_chunks = total_rows // chunk_size
+    
+    # The writer truncates any file left over from a previous run.
+    # For CSV, only the first chunk writes the header.
+    with ChunkWriter(filename, file_format) as writer:
+        for i in range(num_chunks):
+            chunk = create_dummy_chunk(chunk_id=i, num_rows_per_chunk=chunk_size, seed=seed)
+            writer.write(chunk)
+            
+            # Progress indicator
+            if (i + 1) % 10 == 0:
+                print(f"  ... {i+1}/{num_chunks} chunks written")
+            
+    end_time = time.time()
+    print_generation_summary(filename, num_chunks * chunk_size, end_time - start_time)
+
+def generate_large_csv_parallel(filename, total_rows, chunk_size, workers=None, seed=42, file_format='csv'):
+    """
+    Generates the same file as generate_large_csv, but builds the chunks in
+    parallel worker processes and streams them to the file in chunk order.
+    """
+    workers = workers or os.cpu_count()
+    
+    print(f"Starting to generate '{filename}' ({file_format}) with {total_rows:,} rows using {workers} workers...")
+    start_time = time.time()
+    
+    num_chunks = total_rows // chunk_size
+    
+    # Only keep a few chunks in flight per worker so memory stays bounded
+    # even when the disk is slower than the workers.
+    max_in_flight = workers * 2
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor, ChunkWriter(filename, file_format) as writer:
+        pending = deque()
+        next_chunk = 0
+        
+        for i in range(num_chunks):
+            while next_chunk < num_chunks and len(pending) < max_in_flight:
+                pending.append(executor.submit(_build_chunk, next_chunk, chunk_size, seed, file_format))
+                next_chunk += 1
+            
+            # Wait for the oldest chunk so the file is always written in order
+            writer.write(pending.popleft().result())
+            
+            # Progress indicator
+            if (i + 1) % 10 == 0:
+                print(f"  ... {i+1}/{num_chunks} chunks written")
+    
+    end_time = time.time()
+    print_generation_summary(filename, num_chunks * chunk_size, end_time - start_time)
 
 
 # --- Main execution ---
@@ -74,8 +192,22 @@ if __name__ == "__main__":
     # 100,000 is a safe number for most computers.
     CHUNK_SIZE = 1000000
     
-    # Set the desired filename.
-    FILENAME = "large_transactions_dataset.csv"
+    # Set the desired filename (the extension follows --format).
+    FILENAME = "large_transactions_dataset"
     
-    generate_large_csv(FILENAME, TOTAL_ROWS, CHUNK_SIZE)
-
+    parser = argparse.ArgumentParser(description="Generate a large synthetic transactions dataset.")
+    parser.add_argument('--rows', type=int, default=TOTAL_ROWS, help="Total number of rows to generate.")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="Rows generated per chunk.")
+    parser.add_argument('--output', default=None, help="Output file name (default: large_transactions_dataset.<format>).")
+    parser.add_argument('--format', choices=list(FILE_EXTENSIONS), default='csv', help="Output file format.")
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes (1 = original sequential mode, 0 = all cores).")
+    parser.add_argument('--seed', type=int, default=42, help="Base random seed; each chunk derives its own seed from it.")
+    args = parser.parse_args()
+    
+    output = args.output or FILENAME + FILE_EXTENSIONS[args.format]
+    
+    if args.workers == 1:
+        generate_large_csv(output, args.rows, args.chunk_size, seed=args.seed, file_format=args.format)
+    else:
+        generate_large_csv_parallel(output, args.rows, args.chunk_size, workers=args.workers or None,
+                                    seed=args.seed, file_format=args.format)
@@ -1,14 +1,62 @@
-import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
+import argparse
 import os
 import time
+from functools import partial
+
+from chunk import iter_chunks
+from chunk_pipeline import run_chunk_pipeline
+from eda_aggregates import aggregate_file
+from quantile_sketch import HistogramQuantileSketch, MemmapColumn
 
 # --- Part 2: Taming the Beast - Cleaning in Chunks ---
 
-def clean_large_csv(input_filename, output_filename, chunk_size=200000):
+def compute_fill_value(input_filename, chunk_size=200000, quantile=0.5, method='exact'):
+    """
+    First pass: computes the global quantile (the median by default) of
+    'transaction_amount' over the whole file, in bounded memory.
+
+    method='exact' spills the column to a memory-mapped file and selects the
+    exact value; method='histogram' uses a streaming histogram at cent
+    resolution, which is exact for amounts rounded to cents.
+    """
+    if method == 'exact':
+        sketch = MemmapColumn()
+    elif method == 'histogram':
+        sketch = HistogramQuantileSketch(resolution=0.01)
+    else:
+        raise ValueError(f"Unknown method '{method}'. Use 'exact' or 'histogram'.")
+
+    try:
+        for chunk in iter_chunks(input_filename, chunk_size, columns=['transaction_amount']):
+            sketch.update(chunk['transaction_amount'])
+        return sketch.quantile(quantile)
+    finally:
+        if method == 'exact':
+            sketch.close()
+
+def clean_chunk(chunk, fill_value):
+    """Cleans a single chunk: fills missing 'transaction_amount' values with the global fill value."""
+    chunk['transaction_amount'] = chunk['transaction_amount'].fillna(fill_value)
+    return chunk
+
+def _clean_chunk_to_csv(chunk_index, chunk, fill_value):
+    """Worker task for the pipelined mode: cleans a chunk and renders it as CSV text."""
+    return len(chunk), clean_chunk(chunk, fill_value).to_csv(header=(chunk_index == 0), index=False)
+
+def clean_large_csv(input_filename, output_filename, chunk_size=200000, fill_quantile=0.5, fill_method='exact',
+                    workers=1, prefetch=2):
     """
     Reads a large CSV in chunks, cleans it, and saves it to a new file.
+    The input can also be a .parquet or .feather file from the generator.
+
+    Missing amounts are filled with the global fill_quantile of the whole
+    file (computed in a first pass), so the output does not depend on chunk_size.
+
+    With workers > 1, chunks are read ahead by a reader thread (up to
+    prefetch chunks), cleaned in a pool of worker processes and appended
+    to the output in order by a single writer.
     """
     print(f"--- Starting Part 2: Cleaning '{input_filename}' ---")
     start_time = time.time()
@@ -18,32 +66,46 @@ def clean_large_csv(input_filename, output_filename, chunk_size=200000):
         os.remove(output_filename)
         print(f"Removed existing file: '{output_filename}'")
         
-    # Create an iterator to read the large file
+    # Pass 1: compute the global fill value, then create an iterator for pass 2
     try:
-        data_chunks = pd.read_csv(input_filename, chunksize=chunk_size)
+        fill_value = compute_fill_value(input_filename, chunk_size, quantile=fill_quantile, method=fill_method)
+        data_chunks = iter_chunks(input_filename, chunk_size)
     except FileNotFoundError:
         print(f"ERROR: The input file '{input_filename}' was not found.")
         print("Please make sure you have run the data generator script first.")
         return False
+    print(f"Global {fill_quantile:.0%} quantile of 'transaction_amount' ({fill_method}): {fill_value:.2f}")
 
     is_first_chunk = True
     total_rows_processed = 0
 
-    print("Processing file in chunks...")
-    for chunk in data_chunks:
-        # a. Handle missing 'transaction_amount' values
-        chunk_median = chunk['transaction_amount'].median()
-        chunk['transaction_amount'].fillna(chunk_median, inplace=True)
-        
-        # b. Append the cleaned chunk to the new file
-        chunk.to_csv(output_filename, mode='a', header=is_first_chunk, index=False)
-        
-        # Ensure the header is only written once
-        if is_first_chunk:
-            is_first_chunk = False
+    if workers > 1:
+        print(f"Processing file in chunks with {workers} workers...")
+        with open(output_filename, 'w', newline='') as output_file:
+            def write_cleaned_chunk(result):
+                nonlocal total_rows_processed
+                num_rows, csv_text = result
+                output_file.write(csv_text)
+                total_rows_processed += num_rows
+                print(f"  ... Processed {total_rows_processed:,} rows")
+
+            run_chunk_pipeline(data_chunks, partial(_clean_chunk_to_csv, fill_value=fill_value),
+                               write_cleaned_chunk, workers=workers, prefetch=prefetch)
+    else:
+        print("Processing file in chunks...")
+        for chunk in data_chunks:
+            # a. Handle missing 'transaction_amount' values with the global fill value
+            chunk = clean_chunk(chunk, fill_value)
+            
+            # b. Append the cleaned chunk to the new file
+            chunk.to_csv(output_filename, mode='a', header=is_first_chunk, index=False)
             
-        total_rows_processed += len(chunk)
-        print(f"  ... Processed {total_rows_processed:,} rows")
+            # Ensure the header is only written once
+            if is_first_chunk:
+                is_first_chunk = False
+                
+            total_rows_processed += len(chunk)
+            print(f"  ... Processed {total_rows_processed:,} rows")
 
     end_time = time.time()
     print("\n--- Cleaning Complete! ---")
@@ -53,24 +115,25 @@ def clean_large_csv(input_filename, output_filename, chunk_size=200000):
 
 # --- Part 3: The Detective Work - EDA on Clean Data ---
 
-def perform_eda(cleaned_filename):
+def perform_eda(cleaned_filename, chunk_size=500000):
     """
-    Loads the cleaned data and performs exploratory data analysis.
+    Summarizes the cleaned data in one chunked pass and performs exploratory
+    data analysis on the small aggregate tables.
     """
     print(f"\n--- Starting Part 3: EDA on '{cleaned_filename}' ---")
     
     try:
-        df = pd.read_csv(cleaned_filename)
-        # Convert timestamp to datetime objects for time-based analysis
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        # Only the running totals are kept in memory, never the full file
+        aggregates = aggregate_file(cleaned_filename, chunk_size)
     except FileNotFoundError:
         print(f"ERROR: The cleaned file '{cleaned_filename}' was not found.")
         return
+    print(f"Aggregated {aggregates.rows:,} rows.")
 
     # --- EDA Task 1: Category Performance ---
     print("\nAnalyzing: Average transaction amount per category...")
     plt.figure(figsize=(12, 7))
-    avg_amount_by_category = df.groupby('product_category')['transaction_amount'].mean().sort_values(ascending=False)
+    avg_amount_by_category = aggregates.avg_amount_by_category()
     sns.barplot(x=avg_amount_by_category.index, y=avg_amount_by_category.values, palette='viridis')
     plt.title('Average Transaction Amount by Product Category', fontsize=16)
     plt.xlabel('Product Category', fontsize=12)
@@ -83,8 +146,8 @@ def perform_eda(cleaned_filename):
     # --- EDA Task 2: Fraud Analysis ---
     print("\nAnalyzing: Number of fraudulent transactions per category...")
     plt.figure(figsize=(12, 7))
-    fraudulent_df = df[df['is_fraudulent'] == 1]
-    sns.countplot(x='product_category', data=fraudulent_df, order=fraudulent_df['product_category'].value_counts().index, palette='Reds_r')
+    fraud_by_category = aggregates.fraud_count_by_category()
+    sns.barplot(x=fraud_by_category.index, y=fraud_by_category.values, order=fraud_by_category.index, palette='Reds_r')
     plt.title('Number of Fraudulent Transactions by Product Category', fontsize=16)
     plt.xlabel('Product Category', fontsize=12)
     plt.ylabel('Count of Fraudulent Transactions', fontsize=12)
@@ -95,9 +158,9 @@ def perform_eda(cleaned_filename):
 
     # --- EDA Task 3: Time-Based Patterns ---
     print("\nAnalyzing: Number of transactions per month...")
-    df['month'] = df['timestamp'].dt.month
     plt.figure(figsize=(12, 7))
-    sns.countplot(x='month', data=df, palette='coolwarm')
+    count_by_month = aggregates.count_by_month()
+    sns.barplot(x=count_by_month.index, y=count_by_month.values, palette='coolwarm')
     plt.title('Total Number of Transactions per Month', fontsize=16)
     plt.xlabel('Month', fontsize=12)
     plt.ylabel('Number of Transactions', fontsize=12)
@@ -107,8 +170,11 @@ def perform_eda(cleaned_filename):
 
     # --- EDA Task 4: Outlier Detection ---
     print("\nAnalyzing: Distribution of transaction amounts...")
-    plt.figure(figsize=(12, 7))
-    sns.boxplot(x='transaction_amount', data=df, palette='pastel')
+    fig, ax = plt.subplots(figsize=(12, 7))
+    # The box plot is drawn from precomputed statistics (quartiles, whiskers, outliers)
+    ax.bxp([aggregates.amount_boxplot_stats()], orientation='horizontal', patch_artist=True,
+           boxprops={'facecolor': sns.color_palette('pastel')[0]})
+    ax.set_yticks([])
     plt.title('Distribution of Transaction Amounts', fontsize=16)
     plt.xlabel('Transaction Amount ($)', fontsize=12)
     plt.show()
@@ -122,8 +188,14 @@ if __name__ == "__main__":
     INPUT_FILENAME = "large_transactions_dataset.csv"
     CLEANED_FILENAME = "cleaned_transactions.csv"
     
+    parser = argparse.ArgumentParser(description="Clean the large transactions dataset and run the EDA.")
+    parser.add_argument('--input', default=INPUT_FILENAME, help="Input file (.csv, .parquet or .feather).")
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes for cleaning (1 = sequential).")
+    parser.add_argument('--prefetch', type=int, default=2, help="Chunks the reader may parse ahead in pipelined mode.")
+    args = parser.parse_args()
+    
     # Run Part 2
-    cleaning_successful = clean_large_csv(INPUT_FILENAME, CLEANED_FILENAME)
+    cleaning_successful = clean_large_csv(args.input, CLEANED_FILENAME, workers=args.workers, prefetch=args.prefetch)
     
     # Run Part 3 only if cleaning was successful
     if cleaning_successful:
@@ -0,0 +1,74 @@
+import pandas as pd
+
+from chunk import iter_chunks
+from quantile_sketch import HistogramQuantileSketch
+
+# Only these columns are needed for the EDA summaries
+EDA_COLUMNS = ['transaction_amount', 'product_category', 'timestamp', 'is_fraudulent']
+
+
+class TransactionAggregates:
+    """
+    Incremental EDA summaries for the transactions dataset.
+
+    Each chunk only updates a few small running totals, and two aggregates
+    built from different parts of the file can be merged. Only these tiny
+    frames ever reach the plotting code, never the full dataset.
+    """
+
+    def __init__(self):
+        self.category_totals = pd.DataFrame(columns=['sum', 'count'], dtype='float64')
+        self.fraud_counts = pd.Series(dtype='int64')
+        self.month_counts = pd.Series(dtype='int64')
+        self.amount_sketch = HistogramQuantileSketch(resolution=0.01)
+        self.rows = 0
+
+    def update(self, chunk):
+        """Adds one chunk of (cleaned) transactions to the running totals."""
+        timestamps = chunk['timestamp']
+        if not pd.api.types.is_datetime64_any_dtype(timestamps):
+            timestamps = pd.to_datetime(timestamps)
+
+        category_totals = chunk.groupby('product_category', observed=True)['transaction_amount'].agg(['sum', 'count'])
+        fraud_counts = chunk.loc[chunk['is_fraudulent'] == 1, 'product_category'].value_counts()
+        month_counts = timestamps.dt.month.value_counts()
+
+        self._add(category_totals, fraud_counts, month_counts)
+        self.amount_sketch.update(chunk['transaction_amount'])
+        self.rows += len(chunk)
+        return self
+
+    def merge(self, other):
+        """Adds the totals of another TransactionAggregates."""
+        self._add(other.category_totals, other.fraud_counts, other.month_counts)
+        self.amount_sketch.merge(other.amount_sketch)
+        self.rows += other.rows
+        return self
+
+    def _add(self, category_totals, fraud_counts, month_counts):
+        self.category_totals = self.category_totals.add(category_totals, fill_value=0)
+        self.fraud_counts = self.fraud_counts.add(fraud_counts, fill_value=0).astype('int64')
+        self.month_counts = self.month_counts.add(month_counts, fill_value=0).astype('int64')
+
+    # --- Final summaries, ready for plotting ---
+
+    def avg_amount_by_category(self):
+        totals = self.category_totals
+        return (totals['sum'] / totals['count']).sort_values(ascending=False)
+
+    def fraud_count_by_category(self):
+        return self.fraud_counts.sort_values(ascending=False)
+
+    def count_by_month(self):
+        return self.month_counts.sort_index()
+
+    def amount_boxplot_stats(self):
+        return self.amount_sketch.boxplot_stats()
+
+
+def aggregate_file(filename, chunk_size=500000):
+    """Builds TransactionAggregates for a whole file in a single chunked pass."""
+    aggregates = TransactionAggregates()
+    for chunk in iter_chunks(filename, chunk_size, columns=EDA_COLUMNS):
+        aggregates.update(chunk)
+    return aggregates
@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+import argparse
+import joblib
+import os
+import time
+from sklearn.linear_model import SGDClassifier
+
+from chunk import iter_chunks
+from ecommerce_challenge import compute_fill_value, clean_chunk
+
+# --- Out-of-core training for the 'is_fraudulent' flag ---
+# The file is streamed chunk by chunk (with the same cleaning as
+# clean_large_csv) into SGDClassifier.partial_fit, so the whole dataset never
+# has to fit in memory. Categorical fields are one-hot encoded with the
+# hashing trick: every value is hashed straight to a column index, so there
+# is no vocabulary to build or store, even for the 40k distinct user_ids.
+
+HASHED_FIELDS = ['product_category', 'user_id', 'hour', 'weekday']
+NUMERIC_FEATURES = ['log_amount']
+# Resolution of the score histograms used for the progressive ROC AUC
+AUC_BINS = 1000
+TRAINING_COLUMNS = ['transaction_amount', 'product_category', 'user_id', 'timestamp', 'is_fraudulent']
+
+
+def hashed_features(chunk, n_features=2 ** 20):
+    """
+    Sparse feature matrix for one chunk: the numeric features in the first
+    columns, then one hashed indicator column per categorical field.
+
+    Every value is hashed as a 'field=value' string, so equal values in
+    different fields land in different columns:
+
+    >>> chunk = pd.DataFrame({'transaction_amount': [10.0], 'product_category': ['Books'],
+    ...                       'user_id': [3], 'timestamp': [pd.Timestamp('2024-01-04 03:00')]})
+    >>> columns = hashed_features(chunk).indices[1:]
+    >>> len(set(columns.tolist()))
+    4
+    """
+    timestamps = chunk['timestamp']
+    if not pd.api.types.is_datetime64_any_dtype(timestamps):
+        timestamps = pd.to_datetime(timestamps)
+    fields = {
+        'product_category': chunk['product_category'].astype(str).to_numpy(dtype=str),
+        'user_id': chunk['user_id'].to_numpy(),
+        'hour': timestamps.dt.hour.to_numpy(),
+        'weekday': timestamps.dt.dayofweek.to_numpy(),
+    }
+    n_rows = len(chunk)
+    n_numeric = len(NUMERIC_FEATURES)
+    n_hashed = n_features - n_numeric
+
+    # hash_array only salts object arrays with hash_key, so the field name is
+    # put into the value itself ('hour=3' and 'weekday=3' hash differently)
+    hashed = [n_numeric + pd.util.hash_array(np.char.add(f'{field}=', fields[field].astype(str)).astype(object))
+              % n_hashed for field in HASHED_FIELDS]
+    numeric = [np.log1p(chunk['transaction_amount'].to_numpy(dtype='float64'))]
+
+    # Row i has the numeric values followed by a 1 for each hashed field
+    indices = np.column_stack([np.tile(np.arange(n_numeric), (n_rows, 1))] + [h.astype('int64') for h in hashed])
+    data = np.column_stack(numeric + [np.ones(n_rows)] * len(HASHED_FIELDS))
+    row_length = n_numeric + len(HASHED_FIELDS)
+    indptr = np.arange(0, (n_rows + 1) * row_length, row_length)
+    return sp.csr_matrix((data.ravel(), indices.ravel(), indptr), shape=(n_rows, n_features))
+
+
+def balanced_weights(y, class_counts):
+    """
+    Adds the labels y to the running class_counts (updated in place) and
+    returns per-row weights that balance the classes seen so far, like
+    class_weight='balanced' but from two counts instead of the whole label column.
+    """
+    class_counts += np.bincount(y, minlength=2)
+    class_weights = class_counts.sum() / (2 * np.maximum(class_counts, 1))
+    return class_weights[y]
+
+
+def binned_auc(positive_counts, negative_counts):
+    """
+    ROC AUC from histograms of the predicted scores of each class (fixed
+    memory, so it can be accumulated over the whole stream). Scores in the
+    same bin count as ties.
+    """
+    negatives_below = np.cumsum(negative_counts) - negative_counts
+    pairs = positive_counts.sum() * negative_counts.sum()
+    if pairs == 0:
+        return float('nan')
+    return float(np.sum(positive_counts * (negatives_below + 0.5 * negative_counts)) / pairs)
+
+
+def save_checkpoint(state, checkpoint_path):
+    """Writes the training state atomically (a crash never leaves a half-written file)."""
+    temp_path = checkpoint_path + '.tmp'
+    joblib.dump(state, temp_path)
+    os.replace(temp_path, checkpoint_path)
+
+
+def train_fraud_model(input_filename, checkpoint_path='fraud_model.joblib', chunk_size=200000, n_features=2 ** 20,
+                      checkpoint_every=10, resume=False, fill_value=None):
+    """
+    Trains a logistic regression (SGDClassifier with log loss) on the
+    whole file in one streaming pass and returns the final training state.
+
+    Missing amounts are filled like clean_large_csv does (the global median,
+    from a first pass, unless fill_value is given). Every checkpoint_every
+    chunks the model, the class counts and the position in the file are
+    saved; with resume=True, training continues from the last checkpoint
+    (with the checkpoint's chunk_size, so the model sees the same chunks
+    as in one uninterrupted run).
+    Each chunk is scored before the model learns from it (progressive
+    validation), so the reported ROC AUC is always on unseen rows.
+    """
+    if resume and os.path.exists(checkpoint_path):
+        state = joblib.load(checkpoint_path)
+        print(f"Resuming from '{checkpoint_path}' after {state['rows']:,} rows ({state['chunks']} chunks).")
+        if chunk_size != state['chunk_size']:
+            print(f"Using the checkpoint's chunk size of {state['chunk_size']:,} rows instead of {chunk_size:,}.")
+    else:
+        if fill_value is None:
+            print("Computing the global median amount...")
+            fill_value = compute_fill_value(input_filename, chunk_size, method='histogram')
+        state = {
+            # A small, adaptive step size keeps the heavily reweighted fraud rows from blowing up the weights
+            'model': SGDClassifier(loss='log_loss', alpha=1e-5, learning_rate='adaptive', eta0=0.01,
+                                   random_state=42),
+            'n_features': n_features,
+            'chunk_size': chunk_size,
+            'fill_value': fill_value,
+            'class_counts': np.zeros(2, dtype='int64'),
+            'chunks': 0,
+            'rows': 0,
+            'score_histograms': np.zeros((2, AUC_BINS), dtype='int64'),
+        }
+
+    model = state['model']
+    # Start after the rows the checkpoint has already learned from (they are not parsed again)
+    chunks = iter_chunks(input_filename, state['chunk_size'], columns=TRAINING_COLUMNS, skip_rows=state['rows'])
+
+    start_time = time.time()
+    rows_this_run = 0
+    for chunk in chunks:
+        chunk = clean_chunk(chunk, state['fill_value'])
+        X = hashed_features(chunk, state['n_features'])
+        y = chunk['is_fraudulent'].to_numpy(dtype='int64')
+
+        if state['chunks'] > 0:
+            bins = np.minimum((model.predict_proba(X)[:, 1] * AUC_BINS).astype('int64'), AUC_BINS - 1)
+            np.add.at(state['score_histograms'], (y, bins), 1)
+
+        model.partial_fit(X, y, classes=[0, 1], sample_weight=balanced_weights(y, state['class_counts']))
+        state['chunks'] += 1
+        state['rows'] += len(chunk)
+        rows_this_run += len(chunk)
+
+        if state['chunks'] % checkpoint_every == 0:
+            save_checkpoint(state, checkpoint_path)
+            elapsed = time.time() - start_time
+            print(f"  {state['rows']:,} rows, {rows_this_run / elapsed:,.0f} rows/sec, "
+                  f"progressive ROC AUC {binned_auc(*state['score_histograms'][::-1]):.4f} (checkpoint saved)")
+
+    save_checkpoint(state, checkpoint_path)
+    elapsed = time.time() - start_time
+    print(f"Trained on {rows_this_run:,} rows in {elapsed:.2f} s ({rows_this_run / max(elapsed, 1e-9):,.0f} rows/sec). "
+          f"Total {state['rows']:,} rows; fraud share {state['class_counts'][1] / max(state['rows'], 1):.2%}; "
+          f"progressive ROC AUC {binned_auc(*state['score_histograms'][::-1]):.4f}.")
+    print(f"Model saved to '{checkpoint_path}'.")
+    return state
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train a fraud classifier on the transactions file, out of core.")
+    parser.add_argument('--input', default="large_transactions_dataset.csv",
+                        help="Input file (.csv, .parquet or .feather).")
+    parser.add_argument('--model', default='fraud_model.joblib', help="Checkpoint / model file.")
+    parser.add_argument('--chunk-size', type=int, default=200000)
+    parser.add_argument('--hash-bits', type=int, default=20, help="Hashed feature space size is 2**bits.")
+    parser.add_argument('--checkpoint-every', type=int, default=10, help="Save the model every N chunks.")
+    parser.add_argument('--resume', action='store_true', help="Continue from the checkpoint in --model.")
+    args = parser.parse_args()
+
+    train_fraud_model(args.input, args.model, chunk_size=args.chunk_size, n_features=2 ** args.hash_bits,
+                      checkpoint_every=args.checkpoint_every, resume=args.resume)
@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+import os
+import tempfile
+
+# --- Streaming quantiles in bounded memory ---
+# Both tools below see the data one chunk at a time, so the result does not
+# depend on the chunk size and the full column never has to fit in RAM.
+
+
+class HistogramQuantileSketch:
+    """
+    Mergeable histogram of values rounded to a fixed resolution.
+
+    Memory grows with the number of distinct rounded values, not with the
+    number of rows. Quantiles are exact when every value is already a
+    multiple of the resolution (e.g. money amounts in cents).
+    """
+
+    def __init__(self, resolution=0.01):
+        self.resolution = resolution
+        self.counts = pd.Series(dtype='int64')
+
+    def update(self, values):
+        """Adds a chunk of values to the histogram. NaNs are ignored."""
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        keys, counts = np.unique(np.round(values / self.resolution).astype('int64'), return_counts=True)
+        self.counts = self.counts.add(pd.Series(counts, index=keys), fill_value=0).astype('int64')
+        return self
+
+    def merge(self, other):
+        """Adds the counts of another sketch built with the same resolution."""
+        if other.resolution != self.resolution:
+            raise ValueError("Can only merge sketches with the same resolution.")
+        self.counts = self.counts.add(other.counts, fill_value=0).astype('int64')
+        return self
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    def quantile(self, q=0.5):
+        """Returns the q-quantile using the same linear interpolation as pandas."""
+        if self.count == 0:
+            return np.nan
+        counts = self.counts.sort_index()
+        cumulative = counts.cumsum().to_numpy()
+        keys = counts.index.to_numpy()
+
+        position = q * (self.count - 1)
+        lower_rank, upper_rank = int(np.floor(position)), int(np.ceil(position))
+        lower = keys[np.searchsorted(cumulative, lower_rank, side='right')] * self.resolution
+        upper = keys[np.searchsorted(cumulative, upper_rank, side='right')] * self.resolution
+        return lower + (upper - lower) * (position - lower_rank)
+
+    def boxplot_stats(self, whis=1.5, max_fliers=1000):
+        """
+        Returns the box plot statistics in the dict format expected by
+        matplotlib's Axes.bxp: quartiles, 1.5 IQR whiskers and outliers.
+        At most max_fliers distinct outlier values are returned.
+        """
+        q1, median, q3 = self.quantile(0.25), self.quantile(0.5), self.quantile(0.75)
+        iqr = q3 - q1
+        values = self.counts.sort_index().index.to_numpy() * self.resolution
+        inside = values[(values >= q1 - whis * iqr) & (values <= q3 + whis * iqr)]
+        fliers = values[(values < q1 - whis * iqr) | (values > q3 + whis * iqr)]
+        return {
+            'med': median, 'q1': q1, 'q3': q3,
+            'whislo': inside.min(), 'whishi': inside.max(),
+            'fliers': fliers[:max_fliers],
+        }
+
+
+class MemmapColumn:
+    """
+    Spills a numeric column to a temporary file on disk and answers exact
+    quantiles by histogram-guided selection over a memory-mapped view.
+    Only one slice of the file is held in memory at a time.
+    """
+
+    def __init__(self, slice_size=1_000_000, max_candidates=1_000_000, bins=4096):
+        self.slice_size = slice_size
+        self.max_candidates = max_candidates
+        self.bins = bins
+        self._file = tempfile.NamedTemporaryFile(suffix='.f8', delete=False)
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._data = None
+
+    def update(self, values):
+        """Appends a chunk of values to the spill file. NaNs are ignored."""
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        if len(values):
+            self._file.write(values.tobytes())
+            self.count += len(values)
+            self.min = min(self.min, values.min())
+            self.max = max(self.max, values.max())
+        return self
+
+    def _slices(self):
+        if self._data is None:
+            self._file.flush()
+            self._data = np.memmap(self._file.name, dtype='float64', mode='r', shape=(self.count,))
+        for start in range(0, self.count, self.slice_size):
+            yield np.asarray(self._data[start:start + self.slice_size])
+
+    def _in_range(self, values, lo, hi, hi_inclusive):
+        upper = (values <= hi) if hi_inclusive else (values < hi)
+        return values[(values >= lo) & upper]
+
+    def select(self, rank):
+        """Returns the exact value with the given 0-based rank in sorted order."""
+        lo, hi, hi_inclusive = self.min, self.max, True
+        while True:
+            # Count the values left in range and shrink the range to their actual min/max
+            total, actual_min, actual_max = 0, np.inf, -np.inf
+            for s in self._slices():
+                values = self._in_range(s, lo, hi, hi_inclusive)
+                if len(values):
+                    total += len(values)
+                    actual_min = min(actual_min, values.min())
+                    actual_max = max(actual_max, values.max())
+            if actual_min == actual_max:
+                return actual_min
+            lo, hi, hi_inclusive = actual_min, actual_max, True
+
+            if total <= self.max_candidates:
+                candidates = np.concatenate([self._in_range(s, lo, hi, hi_inclusive) for s in self._slices()])
+                return np.partition(candidates, rank)[rank]
+
+            # Too many values left: narrow the range to the histogram bin holding the rank
+            edges = np.linspace(lo, hi, self.bins + 1)
+            histogram = np.zeros(self.bins, dtype='int64')
+            for s in self._slices():
+                histogram += np.histogram(self._in_range(s, lo, hi, hi_inclusive), bins=edges)[0]
+            cumulative = np.cumsum(histogram)
+            b = int(np.searchsorted(cumulative, rank, side='right'))
+            rank -= cumulative[b - 1] if b > 0 else 0
+            lo, hi, hi_inclusive = edges[b], edges[b + 1], (b == self.bins - 1)
+
+    def quantile(self, q=0.5):
+        """Returns the exact q-quantile using the same linear interpolation as pandas."""
+        if self.count == 0:
+            return np.nan
+        position = q * (self.count - 1)
+        lower_rank, upper_rank = int(np.floor(position)), int(np.ceil(position))
+        lower = self.select(lower_rank)
+        upper = lower if upper_rank == lower_rank else self.select(upper_rank)
+        return lower + (upper - lower) * (position - lower_rank)
+
+    def close(self):
+        """Releases the memory map and deletes the spill file."""
+        self._data = None
+        self._file.close()
+        if os.path.exists(self._file.name):
+            os.remove(self._file.name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
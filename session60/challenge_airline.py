@@ -1,17 +1,28 @@
-import pandas as pd
-import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+from flight_loader import load_flights, COMPLETED_FLIGHTS
+from flight_features import add_time_features
+from delay_outliers import DelayHistogram
+from delay_cube import (load_or_build_cube, plot_flights_and_delays, plot_carrier_delay_rate,
+                        plot_delay_rate_by_hour)
+
 # --- Part 1: Loading and Initial Cleaning with Chunking ---
 
 # Define the path to your downloaded dataset file.
 # NOTE: Replace '2008.csv' with the actual path to your file.
 file_path = '2008.csv' 
 
+# The dashboard charts in Part 3 are read off a pre-aggregated delay cube saved here
+cube_path = 'delay_cube_2008.parquet'
+
 # Define a chunk size. 1 million rows is a good starting point.
 chunk_size = 1_000_000
 
+# The 2008 file has about 7 million flights. Sizing the buffer up front
+# means the filtered rows are copied into it exactly once.
+expected_rows = 7_100_000
+
 # We will read the file in chunks and only keep the columns we need for our analysis.
 # This is a crucial memory-saving technique.
 cols_to_keep = [
@@ -21,27 +32,13 @@ cols_to_keep = [
     'Origin', 'Dest', 'Distance', 'Cancelled', 'Diverted'
 ]
 
-# Create an iterator to read the large CSV file in chunks
-chunk_iterator = pd.read_csv(
-    file_path,
-    chunksize=chunk_size,
-    usecols=cols_to_keep,
-    encoding='latin1' # This can help with potential reading errors
-)
-
-# Process each chunk and store the cleaned versions in a list
-list_of_chunks = []
+# Read the file in chunks, keeping only these columns with compact dtypes.
+# For this analysis, we are interested in flights that were not cancelled or diverted,
+# so the filter is applied to each chunk as it is read and the surviving rows are
+# copied straight into one pre-sized buffer (no list of chunks, no final concat).
 print("Starting to process the large file in chunks...")
-
-for i, chunk in enumerate(chunk_iterator):
-    print(f"Processing chunk {i+1}...")
-    # For this analysis, we are interested in flights that were not cancelled or diverted.
-    chunk = chunk[(chunk['Cancelled'] == 0) & (chunk['Diverted'] == 0)]
-    list_of_chunks.append(chunk)
-
-# Concatenate all the processed chunks into a single DataFrame
-print("Concatenating all chunks into a final DataFrame...")
-df = pd.concat(list_of_chunks, ignore_index=True)
+df = load_flights(file_path, cols_to_keep, filters=COMPLETED_FLIGHTS, chunk_size=chunk_size,
+                  expected_rows=expected_rows)
 
 print("Finished loading and initial filtering.")
 print(f"The final DataFrame has {len(df)} rows.")
@@ -61,12 +58,14 @@ df['DepDelay'] = df['DepDelay'].fillna(0)
 # The industry standard often considers a flight delayed if it arrives 15 or more minutes late.
 df['IsDelayed'] = (df['ArrDelay'] > 15).astype(int)
 
-# Feature Engineering: Convert 'DepTime' to hour of the day for analysis.
-# We fill any potential NaNs first, convert to string, pad with zeros, then take the first 2 chars.
-df['Hour'] = df['DepTime'].fillna(0).astype(int).astype(str).str.zfill(4).str[:2]
+# Feature Engineering: Convert the HHMM time columns ('DepTime', 'CRSDepTime', 'ArrTime',
+# 'CRSArrTime') to hour and minute numbers, plus actual-vs-scheduled deltas in minutes.
+# Integer arithmetic (HHMM // 100, HHMM % 100) keeps these as small ints instead of strings.
+df = add_time_features(df)
+df['Hour'] = df['DepHour']
 
 print("Finished cleaning and feature engineering.")
-print(df[['ArrDelay', 'DepDelay', 'IsDelayed', 'Hour']].head())
+print(df[['ArrDelay', 'DepDelay', 'IsDelayed', 'Hour', 'DepDelta']].head())
 print("-" * 40)
 
 
@@ -74,71 +73,49 @@ print("-" * 40)
 
 print("Starting Exploratory Data Analysis...")
 
+# The charts are drawn from a small delay cube keyed by (Month, DayOfWeek, Hour, UniqueCarrier)
+# holding counts, sums and sums of squares. It is built from the file once (in chunks, with every
+# column the dashboards need) and saved to cube_path; later runs just load it, so every chart
+# below is a quick groupby over a few thousand cells instead of a rescan of the full DataFrame.
+cube = load_or_build_cube(file_path, cube_path, chunk_size=chunk_size)
+
 # Visualization 1: Delays by Month
-plt.figure(figsize=(12, 7))
-sns.countplot(x='Month', data=df, hue='IsDelayed', palette=['#22c55e', '#ef4444'])
-plt.title('Total Flights and Delays by Month', fontsize=16)
-plt.xlabel('Month')
-plt.ylabel('Number of Flights')
-plt.legend(title='Status', labels=['On Time', 'Delayed'])
-plt.show()
+plot_flights_and_delays(cube, 'Month', 'Total Flights and Delays by Month', 'Month')
 # Insight: The winter months (December, January, February) and summer months (June, July)
 # appear to have a higher number of delays.
 
 # Visualization 2: Delays by Day of the Week
-plt.figure(figsize=(12, 7))
-sns.countplot(x='DayOfWeek', data=df, hue='IsDelayed', palette=['#22c55e', '#ef4444'])
-plt.title('Total Flights and Delays by Day of the Week', fontsize=16)
-plt.xlabel('Day of the Week (1=Monday, 7=Sunday)')
-plt.ylabel('Number of Flights')
-plt.legend(title='Status', labels=['On Time', 'Delayed'])
-plt.show()
+plot_flights_and_delays(cube, 'DayOfWeek', 'Total Flights and Delays by Day of the Week',
+                        'Day of the Week (1=Monday, 7=Sunday)')
 # Insight: Weekdays, especially Friday (5), seem to experience more delays than weekends.
 
 # Visualization 3: Delays by Airline Carrier
-# Calculate delay rate per carrier to be fair to smaller airlines
-carrier_delays = df.groupby('UniqueCarrier')['IsDelayed'].value_counts(normalize=True).unstack()
-carrier_delays.rename(columns={0: 'OnTime_Rate', 1: 'Delay_Rate'}, inplace=True)
-carrier_delays = carrier_delays.sort_values('Delay_Rate', ascending=False)
-
-plt.figure(figsize=(15, 8))
-carrier_delays['Delay_Rate'].plot(kind='bar', color='skyblue')
-plt.title('Proportion of Delayed Flights by Airline Carrier', fontsize=16)
-plt.xlabel('Airline Carrier')
-plt.ylabel('Proportion of Flights Delayed')
-plt.xticks(rotation=45)
-plt.grid(axis='y', linestyle='--', alpha=0.7)
-plt.show()
+# The delay rate per carrier (delayed flights / all flights) is fair to smaller airlines
+plot_carrier_delay_rate(cube)
 # Insight: There is a significant variation in delay rates among different carriers.
 # Some airlines have a much higher proportion of delayed flights than others.
 
 # Visualization 4: Delays by Hour of the Day
-delay_by_hour = df.groupby('Hour')['IsDelayed'].mean() # Calculate the mean delay rate for each hour
-
-plt.figure(figsize=(14, 7))
-delay_by_hour.plot(kind='line', marker='o', color='purple')
-plt.title('Average Delay Rate by Departure Hour', fontsize=16)
-plt.xlabel('Hour of the Day (24-hour format)')
-plt.ylabel('Proportion of Flights Delayed')
-plt.grid(True, which='both', linestyle='--', linewidth=0.5)
-plt.xticks(np.arange(0, 25, 1))
-plt.show()
+plot_delay_rate_by_hour(cube)
 # Insight: The delay rate is very low in the early morning and increases steadily throughout the day,
 # peaking in the late evening. This suggests delays have a cascading effect.
 
 # --- Your Task: Complete this code ---
 
 # 1. Calculate Q1, Q3, and IQR for the 'ArrDelay' column
-Q1 = df['ArrDelay'].quantile(0.25)
-Q3 = df['ArrDelay'].quantile(0.75)
+# Delays are whole minutes, so a small histogram gives the exact quartiles without sorting.
+# (For files too big to load, delay_outliers.py does the same thing in two streaming passes.)
+delay_histogram = DelayHistogram().update(df['ArrDelay'])
+Q1, Q3, lower_bound, upper_bound = delay_histogram.iqr_bounds()
 IQR = Q3 - Q1
 
 # 2. Calculate the outlier boundaries
-lower_bound = Q1 - 1.5 * IQR
-upper_bound = Q3 + 1.5 * IQR
+print(f"Q1: {Q1}, Q3: {Q3}, IQR: {IQR}")
+print(f"Keeping ArrDelay between {lower_bound} and {upper_bound}")
 
-# 3. Create a new DataFrame that excludes the outliers
-df_no_outliers = df[(df['ArrDelay'] >= lower_bound) & (df['ArrDelay'] <= upper_bound)]
+# 3. Keep only the 'ArrDelay' values without the outliers
+# (the plot only needs this one column, so we don't copy the whole DataFrame)
+arr_delay_no_outliers = df.loc[(df['ArrDelay'] >= lower_bound) & (df['ArrDelay'] <= upper_bound), 'ArrDelay']
 
 # 4. Create a 'before and after' visualization
 fig, axes = plt.subplots(1, 2, figsize=(16, 6))
@@ -146,10 +123,10 @@ fig, axes = plt.subplots(1, 2, figsize=(16, 6))
 sns.boxplot(x=df['ArrDelay'], ax=axes[0])
 axes[0].set_title('Before Outlier Removal')
 
-sns.boxplot(x=df_no_outliers['ArrDelay'], ax=axes[1])
+sns.boxplot(x=arr_delay_no_outliers, ax=axes[1])
 axes[1].set_title('After Outlier Removal')
 
 plt.show()
 
 print(f"Original dataset size: {len(df)}")
-print(f"New dataset size without outliers: {len(df_no_outliers)}")
+print(f"New dataset size without outliers: {len(arr_delay_no_outliers)}")
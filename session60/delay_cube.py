@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+import seaborn as sns
+import matplotlib.pyplot as plt
+import os
+import time
+
+from flight_loader import iter_flight_chunks, COMPLETED_FLIGHTS
+from flight_features import hhmm_to_hour
+
+# --- Pre-aggregated delay cube for the airline dashboards ---
+# One pass over the flights builds a small table keyed by
+# (Month, DayOfWeek, Hour, UniqueCarrier) that holds counts, sums and sums
+# of squares. Every chart is then a groupby over this table (a few
+# thousand rows) instead of a rescan of millions of flights.
+
+CUBE_KEYS = ['Month', 'DayOfWeek', 'Hour', 'UniqueCarrier']
+DELAY_COLUMNS = ['ArrDelay', 'DepDelay']
+CAUSE_COLUMNS = ['CarrierDelay', 'WeatherDelay', 'NASDelay', 'SecurityDelay', 'LateAircraftDelay']
+
+# Columns to read from the raw file when building the cube
+CUBE_SOURCE_COLUMNS = ['Month', 'DayOfWeek', 'DepTime', 'UniqueCarrier', 'Cancelled', 'Diverted'] + DELAY_COLUMNS + CAUSE_COLUMNS
+
+
+def _cube_measures(chunk):
+    """Per-flight measure columns for one chunk, ready to be summed per cube cell."""
+    measures = pd.DataFrame({
+        'Month': chunk['Month'],
+        'DayOfWeek': chunk['DayOfWeek'],
+        'Hour': hhmm_to_hour(chunk['DepTime']),
+        'UniqueCarrier': chunk['UniqueCarrier'],
+        'flights': np.ones(len(chunk), dtype='int64'),
+    })
+    # Same convention as the analysis scripts: unreported delays count as 0,
+    # and a flight is delayed when it arrives more than 15 minutes late.
+    arr_delay = chunk['ArrDelay'].fillna(0)
+    measures['delayed'] = (arr_delay > 15).astype('int64')
+
+    for column in DELAY_COLUMNS + CAUSE_COLUMNS:
+        if column in chunk.columns:
+            values = chunk[column].fillna(0).astype('float64')
+            measures[f'{column}_sum'] = values
+            measures[f'{column}_sumsq'] = values * values
+
+    # Cross products of the delay causes, so correlations can be read off any slice
+    causes = [c for c in CAUSE_COLUMNS if c in chunk.columns]
+    for i, a in enumerate(causes):
+        for b in causes[i + 1:]:
+            measures[f'{a}*{b}_sum'] = measures[f'{a}_sum'] * measures[f'{b}_sum']
+    return measures
+
+
+def build_delay_cube(chunks):
+    """
+    Builds the cube in a single pass over an iterable of flight chunks.
+    The per-flight measures are expanded one chunk at a time, so keep the
+    chunks small (e.g. the chunks of iter_flight_chunks).
+    """
+    cube = None
+    for chunk in chunks:
+        partial = _cube_measures(chunk).groupby(CUBE_KEYS, observed=True).sum()
+        # Each chunk has its own carrier categories, so use plain strings to line the partial cubes up
+        partial.index = partial.index.set_levels(partial.index.levels[-1].astype(str), level='UniqueCarrier')
+        cube = partial if cube is None else cube.add(partial, fill_value=0)
+    # add(fill_value=0) turns every column into float64; the counts are whole numbers
+    cube[['flights', 'delayed']] = cube[['flights', 'delayed']].astype('int64')
+    return cube.sort_index()
+
+
+def save_cube(cube, cube_path):
+    """Persists the cube (a few thousand rows) as a Parquet file."""
+    cube.reset_index().to_parquet(cube_path, index=False)
+
+
+def load_cube(cube_path):
+    return pd.read_parquet(cube_path).set_index(CUBE_KEYS)
+
+
+def load_or_build_cube(file_path, cube_path, chunk_size=1_000_000):
+    """
+    Loads the cube from cube_path when it is newer than file_path;
+    otherwise streams file_path once, builds the cube and saves it.
+    """
+    if os.path.exists(cube_path) and (not os.path.exists(file_path)
+                                      or os.path.getmtime(cube_path) >= os.path.getmtime(file_path)):
+        return load_cube(cube_path)
+
+    print(f"Building delay cube from '{file_path}'...")
+    chunks = iter_flight_chunks(file_path, CUBE_SOURCE_COLUMNS, COMPLETED_FLIGHTS, chunk_size)
+    cube = build_delay_cube(chunks)
+    save_cube(cube, cube_path)
+    print(f"Saved {len(cube):,} cube cells to '{cube_path}'.")
+    return cube
+
+
+# --- Slices of the cube ---
+
+def flights_and_delays_by(cube, key):
+    """On-time and delayed flight counts per value of one key, e.g. 'Month'."""
+    totals = cube.groupby(level=key, observed=True)[['flights', 'delayed']].sum()
+    return pd.DataFrame({'OnTime': totals['flights'] - totals['delayed'], 'Delayed': totals['delayed']})
+
+
+def delay_rate_by(cube, key):
+    """Proportion of delayed flights per value of one key."""
+    totals = cube.groupby(level=key, observed=True)[['flights', 'delayed']].sum()
+    return totals['delayed'] / totals['flights']
+
+
+def cause_totals(cube, columns=CAUSE_COLUMNS):
+    """Total delay minutes per cause."""
+    return pd.Series({column: cube[f'{column}_sum'].sum() for column in columns})
+
+
+def cause_correlation(cube, columns=CAUSE_COLUMNS):
+    """Pearson correlation matrix of the delay causes, from the summed moments."""
+    n = cube['flights'].sum()
+    sums = {c: cube[f'{c}_sum'].sum() for c in columns}
+    sumsq = {c: cube[f'{c}_sumsq'].sum() for c in columns}
+
+    def covariance(a, b):
+        if a == b:
+            cross = sumsq[a]
+        else:
+            cross = cube[f'{a}*{b}_sum'].sum() if f'{a}*{b}_sum' in cube else cube[f'{b}*{a}_sum'].sum()
+        return cross / n - (sums[a] / n) * (sums[b] / n)
+
+    cov = pd.DataFrame([[covariance(a, b) for b in columns] for a in columns], index=columns, columns=columns)
+    std = np.sqrt(np.diag(cov))
+    return cov / np.outer(std, std)
+
+
+# --- Charts drawn from the cube ---
+
+def plot_flights_and_delays(cube, key, title, xlabel):
+    counts = flights_and_delays_by(cube, key)
+    counts.plot(kind='bar', figsize=(12, 7), color=['#22c55e', '#ef4444'], width=0.8)
+    plt.title(title, fontsize=16)
+    plt.xlabel(xlabel)
+    plt.ylabel('Number of Flights')
+    plt.xticks(rotation=0)
+    plt.legend(title='Status', labels=['On Time', 'Delayed'])
+    plt.show()
+
+
+def plot_carrier_delay_rate(cube):
+    delay_rate = delay_rate_by(cube, 'UniqueCarrier').sort_values(ascending=False)
+    plt.figure(figsize=(15, 8))
+    delay_rate.plot(kind='bar', color='skyblue')
+    plt.title('Proportion of Delayed Flights by Airline Carrier', fontsize=16)
+    plt.xlabel('Airline Carrier')
+    plt.ylabel('Proportion of Flights Delayed')
+    plt.xticks(rotation=45)
+    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    plt.show()
+
+
+def plot_delay_rate_by_hour(cube):
+    delay_by_hour = delay_rate_by(cube, 'Hour')
+    plt.figure(figsize=(14, 7))
+    delay_by_hour.plot(kind='line', marker='o', color='purple')
+    plt.title('Average Delay Rate by Departure Hour', fontsize=16)
+    plt.xlabel('Hour of the Day (24-hour format)')
+    plt.ylabel('Proportion of Flights Delayed')
+    plt.grid(True, which='both', linestyle='--', linewidth=0.5)
+    plt.xticks(np.arange(0, 25, 1))
+    plt.show()
+
+
+def plot_cause_totals(cube):
+    total_delays = cause_totals(cube).sort_values(ascending=False)
+    plt.figure(figsize=(12, 7))
+    total_delays.plot(kind='bar', color='skyblue')
+    plt.title('Total Delay Minutes by Cause', fontsize=16)
+    plt.ylabel('Total Minutes (in tens of millions)')
+    plt.xlabel('Reason for Delay')
+    plt.xticks(rotation=45)
+    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    plt.show()
+    return total_delays
+
+
+def plot_cause_correlation(cube):
+    plt.figure(figsize=(10, 8))
+    sns.heatmap(cause_correlation(cube), annot=True, cmap='coolwarm', fmt=".2f")
+    plt.title('Correlation Heatmap of Delay Types', fontsize=16)
+    plt.show()
+
+
+# --- Main execution: the dashboard ---
+if __name__ == "__main__":
+    # NOTE: Replace '2008.csv' with the actual path to your file.
+    FILE_PATH = '2008.csv'
+    CUBE_PATH = 'delay_cube_2008.parquet'
+
+    start_time = time.time()
+    cube = load_or_build_cube(FILE_PATH, CUBE_PATH)
+    print(f"Cube ready in {time.time() - start_time:.3f} seconds ({len(cube):,} cells).")
+
+    plot_flights_and_delays(cube, 'Month', 'Total Flights and Delays by Month', 'Month')
+    plot_flights_and_delays(cube, 'DayOfWeek', 'Total Flights and Delays by Day of the Week',
+                            'Day of the Week (1=Monday, 7=Sunday)')
+    plot_carrier_delay_rate(cube)
+    plot_delay_rate_by_hour(cube)
+    print("--- Total Delay Minutes by Cause ---")
+    print(plot_cause_totals(cube))
+    plot_cause_correlation(cube)
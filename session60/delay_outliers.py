@@ -0,0 +1,147 @@
+import numpy as np
+import argparse
+import os
+
+from flight_loader import iter_flight_chunks, ParquetSink, COMPLETED_FLIGHTS
+
+# --- Streaming IQR outlier removal for delay columns ---
+# Pass 1 builds a small histogram of the delay column to get Q1 and Q3.
+# Pass 2 re-reads the file and emits only the rows inside the IQR fences,
+# chunk by chunk, so even multi-year files never have to fit in memory.
+
+
+class DelayHistogram:
+    """
+    Mergeable histogram of delay values in bins of width `resolution`.
+
+    Bin numbers are stored in the int16 range, so the counts array has a
+    fixed size (65,536 entries) however many rows are added. With the
+    default resolution of 1 minute the quantiles are exact, because BTS
+    delays are whole minutes; a larger resolution gives an approximate,
+    coarser sketch for wider value ranges.
+    """
+
+    _OFFSET = 32768
+
+    def __init__(self, resolution=1):
+        self.resolution = resolution
+        self.counts = np.zeros(2 * self._OFFSET, dtype='int64')
+
+    def update(self, values):
+        """Adds a chunk of values to the histogram. NaNs are ignored."""
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        bins = np.round(values / self.resolution)
+        if len(bins) and (bins.min() < -self._OFFSET or bins.max() >= self._OFFSET):
+            raise ValueError("Values do not fit the int16 bin range; use a larger resolution.")
+        self.counts += np.bincount(bins.astype('int64') + self._OFFSET, minlength=len(self.counts))
+        return self
+
+    def merge(self, other):
+        """Adds the counts of another histogram built with the same resolution."""
+        if other.resolution != self.resolution:
+            raise ValueError("Can only merge histograms with the same resolution.")
+        self.counts += other.counts
+        return self
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    def quantile(self, q):
+        """Returns the q-quantile using the same linear interpolation as pandas."""
+        if self.count == 0:
+            return np.nan
+        cumulative = np.cumsum(self.counts)
+        position = q * (self.count - 1)
+        lower_rank, upper_rank = int(np.floor(position)), int(np.ceil(position))
+        lower = (np.searchsorted(cumulative, lower_rank, side='right') - self._OFFSET) * self.resolution
+        upper = (np.searchsorted(cumulative, upper_rank, side='right') - self._OFFSET) * self.resolution
+        return lower + (upper - lower) * (position - lower_rank)
+
+    def iqr_bounds(self, whis=1.5):
+        """Returns (Q1, Q3, lower_bound, upper_bound) for the usual IQR rule."""
+        q1, q3 = self.quantile(0.25), self.quantile(0.75)
+        iqr = q3 - q1
+        return q1, q3, q1 - whis * iqr, q3 + whis * iqr
+
+
+def _delay_values(chunk, column):
+    # As in the analysis scripts, a delay that was not reported counts as 0
+    return chunk[column].fillna(0)
+
+
+def compute_iqr_bounds(chunks, column='ArrDelay', whis=1.5, resolution=1):
+    """Pass 1: builds a DelayHistogram of `column` over all chunks and returns its IQR bounds."""
+    histogram = DelayHistogram(resolution)
+    for chunk in chunks:
+        histogram.update(_delay_values(chunk, column))
+    return histogram.iqr_bounds(whis)
+
+
+def drop_outliers(chunk, lower_bound, upper_bound, column='ArrDelay'):
+    """Returns the rows of a chunk whose `column` lies within [lower_bound, upper_bound]."""
+    delays = _delay_values(chunk, column)
+    return chunk[(delays >= lower_bound) & (delays <= upper_bound)]
+
+
+def iter_without_outliers(chunks, lower_bound, upper_bound, column='ArrDelay'):
+    """Pass 2: yields each chunk with the rows outside [lower_bound, upper_bound] removed."""
+    for chunk in chunks:
+        yield drop_outliers(chunk, lower_bound, upper_bound, column)
+
+
+def remove_delay_outliers(file_paths, output, columns, column='ArrDelay', filters=COMPLETED_FLIGHTS,
+                          chunk_size=1_000_000, whis=1.5):
+    """
+    Removes IQR outliers of `column` from one or more BTS CSV files (e.g.
+    several years) in two streaming passes. The kept rows are written to
+    `output` (.parquet or .csv) chunk by chunk.
+    Returns (rows_read, rows_written, (q1, q3, lower_bound, upper_bound)).
+    """
+    def all_chunks():
+        for file_path in file_paths:
+            yield from iter_flight_chunks(file_path, columns, filters, chunk_size, verbose=False)
+
+    print("Pass 1: estimating Q1 and Q3...")
+    q1, q3, lower_bound, upper_bound = compute_iqr_bounds(all_chunks(), column, whis)
+    print(f"Q1 = {q1}, Q3 = {q3}, keeping {column} in [{lower_bound}, {upper_bound}]")
+
+    print("Pass 2: writing rows without outliers...")
+    if os.path.exists(output):
+        os.remove(output)
+    sink = ParquetSink(output) if output.endswith('.parquet') else None
+    rows_read = rows_written = 0
+    try:
+        for chunk in all_chunks():
+            kept = drop_outliers(chunk, lower_bound, upper_bound, column)
+            if sink is not None:
+                sink.append(kept)
+            else:
+                # Only the first chunk writes the header
+                kept.to_csv(output, mode='a', header=(rows_read == 0), index=False)
+            rows_read += len(chunk)
+            rows_written += len(kept)
+    finally:
+        if sink is not None:
+            sink.close()
+
+    print(f"Kept {rows_written:,} of {rows_read:,} rows in '{output}'.")
+    return rows_read, rows_written, (q1, q3, lower_bound, upper_bound)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Remove ArrDelay outliers from BTS flight files without loading them.")
+    parser.add_argument('files', nargs='+', help="One or more BTS CSV files, e.g. 2007.csv 2008.csv")
+    parser.add_argument('--output', default='flights_no_outliers.parquet', help="Output .parquet or .csv file.")
+    parser.add_argument('--column', default='ArrDelay', help="Delay column to filter on.")
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    columns = [
+        'Year', 'Month', 'DayofMonth', 'DayOfWeek', 'DepTime', 'CRSDepTime',
+        'ArrTime', 'CRSArrTime', 'UniqueCarrier', 'FlightNum', 'TailNum',
+        'ActualElapsedTime', 'CRSElapsedTime', 'AirTime', 'ArrDelay', 'DepDelay',
+        'Origin', 'Dest', 'Distance', 'Cancelled', 'Diverted'
+    ]
+    remove_delay_outliers(args.files, args.output, columns, column=args.column, chunk_size=args.chunk_size)
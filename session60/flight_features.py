@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+# --- Numeric time features for the BTS airline data ---
+# Times in the BTS files are stored as HHMM numbers (e.g. 1345.0 = 13:45).
+# Everything here uses integer arithmetic (// 100 and % 100) instead of
+# building strings, and returns small integer dtypes.
+
+# HHMM column -> prefix used for its derived columns
+TIME_COLUMNS = {
+    'DepTime': 'Dep',
+    'CRSDepTime': 'CRSDep',
+    'ArrTime': 'Arr',
+    'CRSArrTime': 'CRSArr',
+}
+
+
+def _hhmm(times):
+    """HHMM values as int16. Missing times become 0 and 2400 (midnight) becomes 0."""
+    return np.nan_to_num(np.asarray(times, dtype='float64'), nan=0).astype('int16') % 2400
+
+
+def hhmm_to_hour(times):
+    """Hour of the day (0-23) of HHMM times, as int8."""
+    return pd.Series((_hhmm(times) // 100).astype('int8'), index=getattr(times, 'index', None))
+
+
+def hhmm_to_minute(times):
+    """Minute of the hour (0-59) of HHMM times, as int8."""
+    return pd.Series((_hhmm(times) % 100).astype('int8'), index=getattr(times, 'index', None))
+
+
+def hhmm_to_minutes_of_day(times):
+    """Minutes since midnight (0-1439) of HHMM times, as int16."""
+    return pd.Series(_minutes_of_day(_hhmm(times)), index=getattr(times, 'index', None))
+
+
+def _minutes_of_day(hhmm):
+    return (hhmm // 100) * 60 + hhmm % 100
+
+
+def _wrap_delta(actual_minutes, scheduled_minutes):
+    """Minute differences wrapped around midnight into -720..719, as int16."""
+    return ((actual_minutes - scheduled_minutes + 720) % 1440 - 720).astype('int16')
+
+
+def clock_delta(actual, scheduled):
+    """
+    Actual minus scheduled clock time in minutes, as int16.
+    Differences wrap around midnight into the range -720..719, so a flight
+    scheduled at 23:50 that left at 00:10 is 20 minutes late, not -1420.
+    """
+    delta = _wrap_delta(_minutes_of_day(_hhmm(actual)), _minutes_of_day(_hhmm(scheduled)))
+    return pd.Series(delta, index=getattr(actual, 'index', None))
+
+
+def add_time_features(df):
+    """
+    Adds numeric hour/minute columns for every HHMM time column present
+    (e.g. DepHour, DepMinute, CRSArrHour, ...), plus DepDelta and ArrDelta:
+    the actual minus scheduled clock time in minutes (see clock_delta).
+    Each time column is converted once and everything is derived from that.
+    """
+    minutes_of_day = {}
+    for column, prefix in TIME_COLUMNS.items():
+        if column in df.columns:
+            hhmm = _hhmm(df[column])
+            df[f'{prefix}Hour'] = (hhmm // 100).astype('int8')
+            df[f'{prefix}Minute'] = (hhmm % 100).astype('int8')
+            minutes_of_day[column] = _minutes_of_day(hhmm)
+
+    for actual, scheduled, name in (('DepTime', 'CRSDepTime', 'DepDelta'), ('ArrTime', 'CRSArrTime', 'ArrDelta')):
+        if actual in minutes_of_day and scheduled in minutes_of_day:
+            df[name] = _wrap_delta(minutes_of_day[actual], minutes_of_day[scheduled])
+    return df
@@ -0,0 +1,208 @@
+import numpy as np
+import pandas as pd
+import operator
+
+# --- Reusable loader for the BTS airline on-time CSV files ---
+
+# Compact dtypes applied while parsing. Calendar fields never have missing
+# values, so they fit small integer types; repeated strings become categories.
+FLIGHT_DTYPES = {
+    'Year': 'int16',
+    'Month': 'int8',
+    'DayofMonth': 'int8',
+    'DayOfWeek': 'int8',
+    'UniqueCarrier': 'category',
+    'TailNum': 'category',
+    'Origin': 'category',
+    'Dest': 'category',
+    'Cancelled': 'int8',
+    'Diverted': 'int8',
+}
+
+# Keep only flights that were neither cancelled nor diverted
+COMPLETED_FLIGHTS = [('Cancelled', '==', 0), ('Diverted', '==', 0)]
+
+_OPERATORS = {
+    '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le,
+    '>': operator.gt, '>=': operator.ge,
+}
+
+
+def filter_mask(chunk, filters):
+    """
+    Builds a boolean row mask from filters written as (column, op, value)
+    tuples, e.g. [('Cancelled', '==', 0)]. All filters must hold.
+    op is one of ==, !=, <, <=, >, >=, in, not in.
+    """
+    mask = np.ones(len(chunk), dtype=bool)
+    for column, op, value in filters:
+        if op == 'in':
+            mask &= chunk[column].isin(value).to_numpy()
+        elif op == 'not in':
+            mask &= ~chunk[column].isin(value).to_numpy()
+        else:
+            mask &= _OPERATORS[op](chunk[column], value).to_numpy()
+    return mask
+
+
+def _numpy_dtype(dtype):
+    """Plain numpy dtypes are kept; pandas extension dtypes (e.g. strings) are stored as object."""
+    return dtype if isinstance(dtype, np.dtype) else np.dtype(object)
+
+
+class ColumnBuffer:
+    """
+    Pre-sized, column-by-column storage for the filtered rows.
+
+    Chunks are copied straight into numpy arrays (category columns as codes
+    against one shared category list), so there is no list of chunks and no
+    final concat. When the initial capacity is too small, arrays grow by 50%.
+    """
+
+    def __init__(self, capacity=1_000_000):
+        self.capacity = capacity
+        self.size = 0
+        self.columns = None
+        self.arrays = {}
+        self.categories = {}
+
+    def append(self, chunk):
+        if self.columns is None:
+            self._allocate(chunk)
+        if self.size + len(chunk) > self.capacity:
+            self._grow(self.size + len(chunk))
+
+        end = self.size + len(chunk)
+        for column in self.columns:
+            values = chunk[column]
+            if column in self.categories:
+                values = self._global_codes(column, values)
+            else:
+                # A column can be int in one chunk and float (with NaN) in the next
+                dtype = np.result_type(self.arrays[column].dtype, _numpy_dtype(values.dtype))
+                if dtype != self.arrays[column].dtype:
+                    self.arrays[column] = self.arrays[column].astype(dtype)
+                values = values.to_numpy()
+            self.arrays[column][self.size:end] = values
+        self.size = end
+
+    def _allocate(self, chunk):
+        self.columns = list(chunk.columns)
+        for column in self.columns:
+            if isinstance(chunk[column].dtype, pd.CategoricalDtype):
+                self.categories[column] = {}
+                self.arrays[column] = np.empty(self.capacity, dtype='int32')
+            else:
+                self.arrays[column] = np.empty(self.capacity, dtype=_numpy_dtype(chunk[column].dtype))
+
+    def _grow(self, min_capacity):
+        self.capacity = max(min_capacity, int(self.capacity * 1.5))
+        for column, array in self.arrays.items():
+            grown = np.empty(self.capacity, dtype=array.dtype)
+            grown[:self.size] = array[:self.size]
+            self.arrays[column] = grown
+
+    def _global_codes(self, column, values):
+        """Translates a chunk's category codes to codes in the shared category list."""
+        lookup = self.categories[column]
+        for category in values.cat.categories:
+            lookup.setdefault(category, len(lookup))
+        chunk_to_global = np.array([lookup[c] for c in values.cat.categories] + [-1], dtype='int32')
+        # Missing values have code -1, which picks the trailing -1 above
+        return chunk_to_global[values.cat.codes.to_numpy()]
+
+    def to_frame(self):
+        """Returns the filled part of the buffer as a DataFrame (no copy for numeric columns)."""
+        if self.columns is None:
+            return pd.DataFrame()
+        data = {}
+        for column in self.columns:
+            array = self.arrays[column][:self.size]
+            if column in self.categories:
+                array = pd.Categorical.from_codes(array, categories=list(self.categories[column]))
+            data[column] = array
+        return pd.DataFrame(data, copy=False)
+
+
+class ParquetSink:
+    """Writes each filtered chunk as a row group of a Parquet file."""
+
+    def __init__(self, filename):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._pa = pa
+        self._pq = pq
+        self.filename = filename
+        self.schema = None
+        self._writer = None
+        self.size = 0
+
+    def append(self, chunk):
+        table = self._pa.Table.from_pandas(chunk, preserve_index=False)
+        if self._writer is None:
+            # Chunks have different category lists, so store those columns as
+            # plain strings (Parquet dictionary-encodes them on disk anyway)
+            self.schema = self._pa.schema([
+                field.with_type(self._pa.string()) if self._pa.types.is_dictionary(field.type) else field
+                for field in table.schema
+            ])
+            self._writer = self._pq.ParquetWriter(self.filename, self.schema)
+        self._writer.write_table(table.cast(self.schema))
+        self.size += len(chunk)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def iter_flight_chunks(file_path, columns, filters=None, chunk_size=1_000_000, dtypes=FLIGHT_DTYPES, verbose=True):
+    """
+    Reads a BTS flights CSV in chunks, keeping only the given columns and the
+    rows that pass the filters, with compact dtypes applied while parsing.
+    Returns an iterator of filtered chunks.
+    """
+    read_dtypes = {column: dtype for column, dtype in dtypes.items() if column in columns}
+
+    # Raises FileNotFoundError right away if the file is missing
+    chunk_iterator = pd.read_csv(
+        file_path,
+        chunksize=chunk_size,
+        usecols=columns,
+        dtype=read_dtypes,
+        encoding='latin1' # This can help with potential reading errors
+    )
+    return _filtered_chunks(chunk_iterator, filters or [], verbose)
+
+
+def _filtered_chunks(chunk_iterator, filters, verbose):
+    for i, chunk in enumerate(chunk_iterator):
+        if verbose:
+            print(f"Processing chunk {i+1}...")
+        if filters:
+            chunk = chunk[filter_mask(chunk, filters)]
+        yield chunk
+
+
+def load_flights(file_path, columns, filters=None, chunk_size=1_000_000, expected_rows=None,
+                 output=None, dtypes=FLIGHT_DTYPES, verbose=True):
+    """
+    Loads the filtered rows of a BTS flights CSV (see iter_flight_chunks).
+
+    Filtered rows go straight into a ColumnBuffer and a DataFrame is
+    returned. With output='something.parquet', rows are streamed to a
+    Parquet file instead and the number of rows written is returned.
+    """
+    chunks = iter_flight_chunks(file_path, columns, filters, chunk_size, dtypes, verbose)
+
+    sink = ParquetSink(output) if output else ColumnBuffer(capacity=expected_rows or chunk_size)
+    try:
+        for chunk in chunks:
+            sink.append(chunk)
+    finally:
+        if output:
+            sink.close()
+
+    if output:
+        return sink.size
+    return sink.to_frame()
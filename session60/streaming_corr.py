@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+from flight_loader import iter_flight_chunks, COMPLETED_FLIGHTS
+
+# --- One-pass covariance / correlation for chunked data ---
+# Keeps the running mean and co-moment matrix (Welford's method, with the
+# Chan et al. formula to merge partial results), so memory depends only on
+# the number of columns. Works on any DataFrame chunks, not just flights.
+
+
+class CovarianceAccumulator:
+    """
+    Running mean and co-moment matrix of a fixed list of columns.
+
+    update() adds a chunk, merge() adds another accumulator (e.g. one built
+    by a different worker), and correlation() returns the same matrix as
+    DataFrame.corr(). Rows with a missing value in any of the columns are
+    skipped, so fill or drop NaNs first to match pandas exactly.
+    """
+
+    def __init__(self, columns, block_size=1_000_000):
+        self.columns = list(columns)
+        self.block_size = block_size
+        k = len(self.columns)
+        self.n = 0
+        self.mean = np.zeros(k)
+        self.comoment = np.zeros((k, k))
+
+    def update(self, chunk):
+        """
+        Adds the rows of a DataFrame chunk. The chunk is converted to float64
+        block_size rows at a time, so the temporary memory is bounded by the
+        block size even when a whole loaded DataFrame is passed in.
+        """
+        for start in range(0, len(chunk), self.block_size):
+            block = chunk.iloc[start:start + self.block_size][self.columns].to_numpy(dtype='float64')
+            block = block[~np.isnan(block).any(axis=1)]
+            if len(block) == 0:
+                continue
+            block_mean = block.mean(axis=0)
+            centered = block - block_mean
+            self._combine(len(block), block_mean, centered.T @ centered)
+        return self
+
+    def merge(self, other):
+        """Adds the statistics of another accumulator over the same columns."""
+        if other.columns != self.columns:
+            raise ValueError("Can only merge accumulators over the same columns.")
+        self._combine(other.n, other.mean, other.comoment)
+        return self
+
+    def _combine(self, n_b, mean_b, comoment_b):
+        if n_b == 0:
+            return
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.comoment += comoment_b + np.outer(delta, delta) * (self.n * n_b / n)
+        self.mean += delta * (n_b / n)
+        self.n = n
+
+    def covariance(self, ddof=1):
+        """Covariance matrix as a DataFrame (sample covariance by default, like DataFrame.cov)."""
+        return pd.DataFrame(self.comoment / (self.n - ddof), index=self.columns, columns=self.columns)
+
+    def correlation(self):
+        """Pearson correlation matrix as a DataFrame, like DataFrame.corr()."""
+        std = np.sqrt(np.diag(self.comoment))
+        return pd.DataFrame(self.comoment / np.outer(std, std), index=self.columns, columns=self.columns)
+
+
+def streaming_correlation(chunks, columns, fill_value=None):
+    """
+    Correlation matrix of `columns` over an iterable of chunks, in one pass.
+    With fill_value, missing values are filled first (e.g. 0 for delay minutes).
+    """
+    accumulator = CovarianceAccumulator(columns)
+    for chunk in chunks:
+        chunk = chunk[columns]
+        if fill_value is not None:
+            chunk = chunk.fillna(fill_value)
+        accumulator.update(chunk)
+    return accumulator.correlation()
+
+
+def _accumulate_file(file_path, columns, filters, chunk_size, fill_value):
+    """Worker task: builds the accumulator for one file."""
+    accumulator = CovarianceAccumulator(columns)
+    read_columns = list(dict.fromkeys(columns + [column for column, _, _ in filters]))
+    for chunk in iter_flight_chunks(file_path, read_columns, filters, chunk_size, verbose=False):
+        chunk = chunk[columns]
+        if fill_value is not None:
+            chunk = chunk.fillna(fill_value)
+        accumulator.update(chunk)
+    return accumulator
+
+
+def correlation_of_files(file_paths, columns, filters=COMPLETED_FLIGHTS, chunk_size=1_000_000,
+                         fill_value=0, workers=None):
+    """
+    Correlation matrix of `columns` across several BTS files (e.g. one per
+    year). Each file is accumulated in its own worker process and the
+    partial results are merged at the end.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_accumulate_file, file_path, columns, filters, chunk_size, fill_value)
+                   for file_path in file_paths]
+        accumulator = CovarianceAccumulator(columns)
+        for future in futures:
+            accumulator.merge(future.result())
+    return accumulator.correlation()
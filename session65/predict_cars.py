@@ -2,69 +2,119 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+import joblib
+import os
+import argparse
+import sklearn
+from datetime import datetime
 
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, confusion_matrix, ConfusionMatrixDisplay
 
-# Define Cars dataset directly
-data = pd.read_csv('cars.csv')
-cars = pd.DataFrame(data)
-
-# Assuming the dataset has columns: 'speed', 'doors', and 'type'
-# 'type' is the target variable (categorical), and 'speed' and 'doors' are features
-X_clf = cars[['speed', 'doors', 'seats']]
-y_clf = cars['type']
-
-# Split data
-X_train_clf, X_test_clf, y_train_clf, y_test_clf = train_test_split(
-    X_clf, y_clf, test_size=0.2, random_state=42)
-
-# Train Logistic Regression model
-clf = LogisticRegression(max_iter=1500)
-clf.fit(X_train_clf, y_train_clf)
-
-# Predict
-y_pred_clf = clf.predict(X_test_clf)
-
-# Evaluate
-accuracy = accuracy_score(y_test_clf, y_pred_clf)
-print("Classification - Cars Dataset")
-print(f"Accuracy: {accuracy:.2f}")
-
-# Visualization: Confusion Matrix
-cm = confusion_matrix(y_test_clf, y_pred_clf, labels=clf.classes_)
-disp = ConfusionMatrixDisplay(confusion_matrix=cm, display_labels=clf.classes_)
-disp.plot(cmap=plt.cm.Blues)
-plt.title('Confusion Matrix - Cars Classification')
-plt.savefig('cars_confusion_matrix.png')
-
-# Optional: Pairplot of Cars features colored by type
-cars_df = X_clf.copy()
-cars_df['type'] = y_clf
-sns.pairplot(cars_df, hue='type', diag_kind='kde')
-plt.suptitle('Cars Dataset Feature Pairplot', y=1.02)
-plt.savefig('cars.png')
+from score_cars import MODEL_DIR, MODEL_PATTERN, load_model, score_file
 
-# Function to predict car type for a new dataset
-def predict_car_type_from_file(input_file, output_file):
-    try:
-        # Load the new dataset (without 'type' column)
-        new_data = pd.read_csv(input_file)
+# Assuming the dataset has columns: 'speed', 'doors', 'seats' and 'type'
+# 'type' is the target variable (categorical), and 'speed', 'doors' and 'seats' are features
+FEATURES = ['speed', 'doors', 'seats']
+TARGET = 'type'
+
+
+def train_model(data_file='cars.csv'):
+    """Trains the Logistic Regression classifier and evaluates it on a held-out split."""
+    # Define Cars dataset directly
+    data = pd.read_csv(data_file)
+    cars = pd.DataFrame(data)
+
+    X_clf = cars[FEATURES]
+    y_clf = cars[TARGET]
+
+    # Split data
+    X_train_clf, X_test_clf, y_train_clf, y_test_clf = train_test_split(
+        X_clf, y_clf, test_size=0.2, random_state=42)
+
+    # Train Logistic Regression model
+    clf = LogisticRegression(max_iter=1500)
+    clf.fit(X_train_clf, y_train_clf)
+
+    # Predict
+    y_pred_clf = clf.predict(X_test_clf)
+
+    # Evaluate
+    accuracy = accuracy_score(y_test_clf, y_pred_clf)
+    return clf, accuracy, (X_clf, y_clf, y_test_clf, y_pred_clf)
+
+
+def plot_diagnostics(clf, X_clf, y_clf, y_test_clf, y_pred_clf):
+    """Saves the confusion matrix and the feature pairplot as PNG files."""
+    # Visualization: Confusion Matrix
+    cm = confusion_matrix(y_test_clf, y_pred_clf, labels=clf.classes_)
+    disp = ConfusionMatrixDisplay(confusion_matrix=cm, display_labels=clf.classes_)
+    disp.plot(cmap=plt.cm.Blues)
+    plt.title('Confusion Matrix - Cars Classification')
+    plt.savefig('cars_confusion_matrix.png')
 
-        # Ensure the required columns are present
-        if not {'speed', 'doors', 'seats'}.issubset(new_data.columns):
-            print("Input file must contain 'speed' and 'doors' and 'seats' columns.")
-            return
+    # Optional: Pairplot of Cars features colored by type
+    cars_df = X_clf.copy()
+    cars_df['type'] = y_clf
+    sns.pairplot(cars_df, hue='type', diag_kind='kde')
+    plt.suptitle('Cars Dataset Feature Pairplot', y=1.02)
+    plt.savefig('cars.png')
 
-        # Predict the type using the trained model
-        new_data['type'] = clf.predict(new_data[['speed', 'doors', 'seats']])
 
-        # Save the new dataset with predictions to a file
-        new_data.to_csv(output_file, index=False)
-        print(f"Predictions saved to {output_file}")
+def save_model(clf, accuracy, data_file='cars.csv', model_dir=MODEL_DIR):
+    """
+    Saves the trained model with its metadata as the next version
+    (models/cars_model_v1.joblib, v2, ...). Returns the file path.
+    """
+    os.makedirs(model_dir, exist_ok=True)
+    versions = [int(match.group(1)) for match in map(MODEL_PATTERN.search, os.listdir(model_dir)) if match]
+    version = max(versions, default=0) + 1
+
+    # Only the fitted parameters are stored, so score_cars.py can load and
+    # apply the model without importing scikit-learn
+    artifact = {
+        'coef': clf.coef_,
+        'intercept': clf.intercept_,
+        'version': version,
+        'features': FEATURES,
+        'classes': list(clf.classes_),
+        'accuracy': accuracy,
+        'training_data': data_file,
+        'trained_at': datetime.now().isoformat(timespec='seconds'),
+        'sklearn_version': sklearn.__version__,
+    }
+    model_path = os.path.join(model_dir, f'cars_model_v{version}.joblib')
+    joblib.dump(artifact, model_path)
+    return model_path
+
+
+# Function to predict car type for a new dataset
+def predict_car_type_from_file(input_file, output_file, model_path=None):
+    """Predicts car types with the saved model (the latest version by default), without retraining."""
+    try:
+        rows = score_file(input_file, output_file, load_model(model_path))
+        print(f"Predictions for {rows} rows saved to {output_file}")
     except Exception as e:
         print(f"An error occurred: {e}")
 
-# Example usage
-predict_car_type_from_file('new_cars.csv', 'predicted_cars.csv')
+
+# --- Main execution: training entry point ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the cars classifier and save a versioned model.")
+    parser.add_argument('--data', default='cars.csv', help="Training CSV file.")
+    parser.add_argument('--no-plots', action='store_true', help="Skip the confusion matrix and pairplot PNGs.")
+    args = parser.parse_args()
+
+    clf, accuracy, evaluation = train_model(args.data)
+    print("Classification - Cars Dataset")
+    print(f"Accuracy: {accuracy:.2f}")
+
+    if not args.no_plots:
+        plot_diagnostics(clf, *evaluation)
+
+    model_path = save_model(clf, accuracy, data_file=args.data)
+    print(f"Model saved to {model_path}")
+
+    # Example usage
+    predict_car_type_from_file('new_cars.csv', 'predicted_cars.csv', model_path)
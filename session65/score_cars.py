@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import joblib
+import argparse
+import glob
+import os
+import re
+import time
+
+# --- Batch scoring for the cars classifier ---
+# Loads a model saved by predict_cars.py (no retraining, no plotting) and
+# streams an input CSV through it in chunks, so files of any size work.
+# The saved model is just the logistic regression coefficients, so scoring
+# needs numpy and pandas only; scikit-learn is never imported here.
+
+MODEL_DIR = 'models'
+MODEL_PATTERN = re.compile(r'cars_model_v(\d+)\.joblib$')
+
+
+def latest_model_path(model_dir=MODEL_DIR):
+    """Returns the path of the highest model version in model_dir."""
+    versions = []
+    for path in glob.glob(os.path.join(model_dir, 'cars_model_v*.joblib')):
+        match = MODEL_PATTERN.search(path)
+        if match:
+            versions.append((int(match.group(1)), path))
+    if not versions:
+        raise FileNotFoundError(f"No saved model found in '{model_dir}'. Run predict_cars.py first.")
+    return max(versions)[1]
+
+
+def load_model(model_path=None):
+    """Loads a saved model artifact (the latest version by default)."""
+    return joblib.load(model_path or latest_model_path())
+
+
+def predict(artifact, X):
+    """Same result as LogisticRegression.predict, computed from the saved coefficients."""
+    scores = np.asarray(X, dtype='float64') @ artifact['coef'].T + artifact['intercept']
+    if scores.shape[1] == 1:
+        # Binary model: one score column, positive means the second class
+        class_index = (scores[:, 0] > 0).astype(int)
+    else:
+        class_index = scores.argmax(axis=1)
+    return np.asarray(artifact['classes'])[class_index]
+
+
+def validate_columns(columns, features):
+    """Raises ValueError if any of the model's feature columns is missing."""
+    missing = [feature for feature in features if feature not in columns]
+    if missing:
+        raise ValueError(f"Input file is missing required column(s): {', '.join(missing)}")
+
+
+def score_file(input_file, output_file, artifact, chunk_size=100_000):
+    """
+    Predicts the car type for every row of input_file and writes the rows
+    with a new 'type' column to output_file, one chunk at a time.
+    Returns the number of rows scored.
+    """
+    features = artifact['features']
+
+    # Check the header before reading any data
+    validate_columns(pd.read_csv(input_file, nrows=0).columns, features)
+
+    rows_scored = 0
+    with open(output_file, 'w', newline='') as output:
+        for chunk in pd.read_csv(input_file, chunksize=chunk_size):
+            X = chunk[features].apply(pd.to_numeric, errors='coerce')
+            bad_rows = X.isna().any(axis=1)
+            if bad_rows.any():
+                first_bad = rows_scored + int(bad_rows.to_numpy().argmax()) + 1
+                raise ValueError(f"Non-numeric or missing feature value in data row {first_bad} of '{input_file}'.")
+
+            chunk['type'] = predict(artifact, X)
+            chunk.to_csv(output, header=(rows_scored == 0), index=False)
+            rows_scored += len(chunk)
+    return rows_scored
+
+
+# --- Main execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Predict car types for a CSV file with a saved model.")
+    parser.add_argument('input_file', help="CSV with 'speed', 'doors' and 'seats' columns.")
+    parser.add_argument('output_file', help="Where to write the rows with a predicted 'type' column.")
+    parser.add_argument('--model', default=None, help="Model file (default: latest version in models/).")
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    args = parser.parse_args()
+
+    start_time = time.time()
+    artifact = load_model(args.model)
+    print(f"Loaded model v{artifact['version']} (trained {artifact['trained_at']}) "
+          f"in {(time.time() - start_time) * 1000:.1f} ms")
+
+    rows = score_file(args.input_file, args.output_file, artifact, chunk_size=args.chunk_size)
+    print(f"Scored {rows:,} rows in {(time.time() - start_time) * 1000:.1f} ms")
+    print(f"Predictions saved to {args.output_file}")
@@ -0,0 +1,212 @@
+import numpy as np
+import argparse
+import json
+import queue
+import threading
+import time
+import urllib.request
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from score_cars import load_model, predict
+
+# --- Long-running prediction service for the cars classifier ---
+# The model is loaded once and kept warm. Concurrent requests are queued and
+# a single batching thread answers them together with one vectorized
+# predict call, so many small jobs don't each pay the startup cost.
+#
+#   POST /predict  {"speed": 400, "doors": 2, "seats": 2}  (or a list of such rows)
+#   GET  /stats    request count, batch sizes and latency percentiles
+#   GET  /health
+
+
+class MicroBatcher:
+    """Collects single-row requests and predicts them in batches."""
+
+    def __init__(self, artifact, max_batch_size=256, max_wait_ms=2.0, latency_window=10_000):
+        self.artifact = artifact
+        self.features = artifact['features']
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.requests = queue.Queue()
+        self.latencies = deque(maxlen=latency_window)
+        self.batch_sizes = deque(maxlen=latency_window)
+        self.total_requests = 0
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, row):
+        """Queues one row (a dict of feature values) and returns a Future with its prediction."""
+        missing = [feature for feature in self.features if feature not in row]
+        if missing:
+            raise ValueError(f"Missing feature(s): {', '.join(missing)}")
+        future = Future()
+        values = [float(row[feature]) for feature in self.features]
+        self.requests.put((values, future, time.perf_counter()))
+        return future
+
+    def _run(self):
+        while True:
+            # Block for the first request, then gather more until the batch
+            # is full or the wait budget is used up
+            batch = [self.requests.get()]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.requests.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            X = np.array([values for values, _, _ in batch])
+            try:
+                predictions = predict(self.artifact, X)
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            done = time.perf_counter()
+            with self._lock:
+                self.batch_sizes.append(len(batch))
+                self.total_requests += len(batch)
+                for (_, future, started), prediction in zip(batch, predictions):
+                    self.latencies.append(done - started)
+                    future.set_result(str(prediction))
+
+    def stats(self):
+        """Request count, mean batch size and latency percentiles (in milliseconds)."""
+        with self._lock:
+            latencies = np.array(self.latencies) * 1000
+            batch_sizes = np.array(self.batch_sizes)
+            total = self.total_requests
+        if total == 0:
+            return {'requests': 0}
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+        return {
+            'requests': total,
+            'batches': int(len(batch_sizes)),
+            'mean_batch_size': float(batch_sizes.mean()),
+            'latency_ms': {'p50': float(p50), 'p90': float(p90), 'p99': float(p99), 'max': float(latencies.max())},
+        }
+
+
+def make_handler(batcher):
+    class PredictionHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == '/health':
+                self._send_json(200, {'status': 'ok', 'model_version': batcher.artifact['version']})
+            elif self.path == '/stats':
+                self._send_json(200, batcher.stats())
+            else:
+                self._send_json(404, {'error': 'not found'})
+
+        def do_POST(self):
+            if self.path != '/predict':
+                self._send_json(404, {'error': 'not found'})
+                return
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                rows = payload if isinstance(payload, list) else [payload]
+                futures = [batcher.submit(row) for row in rows]
+                predictions = [future.result() for future in futures]
+            except (ValueError, TypeError, KeyError) as e:
+                self._send_json(400, {'error': str(e)})
+                return
+            if isinstance(payload, list):
+                self._send_json(200, {'type': predictions})
+            else:
+                self._send_json(200, {'type': predictions[0]})
+
+        def log_message(self, format, *args):
+            # Keep the console quiet; use /stats to monitor the service
+            pass
+
+    return PredictionHandler
+
+
+class PredictionServer(ThreadingHTTPServer):
+    # The default listen backlog (5) resets connections under a burst of clients
+    request_queue_size = 128
+
+
+def start_server(host='127.0.0.1', port=8065, model_path=None, max_batch_size=256, max_wait_ms=2.0):
+    """
+    Loads the model and starts the HTTP server in a background thread.
+    Use port=0 to pick a free port. Returns the server; call
+    server.shutdown() to stop it.
+    """
+    batcher = MicroBatcher(load_model(model_path), max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    server = PredictionServer((host, port), make_handler(batcher))
+    server.batcher = batcher
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def request_prediction(url, row):
+    """Local client: posts one row to the server and returns the predicted type."""
+    request = urllib.request.Request(f'{url}/predict', data=json.dumps(row).encode(),
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())['type']
+
+
+def get_stats(url):
+    with urllib.request.urlopen(f'{url}/stats') as response:
+        return json.loads(response.read())
+
+
+def run_load_test(url, num_requests=2000, concurrency=32):
+    """Fires single-row requests from many client threads and prints the server's stats."""
+    rng = np.random.default_rng(0)
+    rows = [{'speed': int(s), 'doors': int(d), 'seats': int(t)}
+            for s, d, t in zip(rng.integers(100, 600, num_requests),
+                               rng.integers(2, 6, num_requests),
+                               rng.integers(2, 8, num_requests))]
+    start_time = time.time()
+    with ThreadPoolExecutor(max_workers=concurrency) as clients:
+        predictions = list(clients.map(lambda row: request_prediction(url, row), rows))
+    elapsed = time.time() - start_time
+
+    print(f"{len(predictions):,} requests from {concurrency} clients in {elapsed:.2f} s "
+          f"({len(predictions) / elapsed:,.0f} requests/sec)")
+    print(json.dumps(get_stats(url), indent=2))
+
+
+# --- Main execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the cars classifier over local HTTP with micro-batching.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8065)
+    parser.add_argument('--model', default=None, help="Model file (default: latest version in models/).")
+    parser.add_argument('--max-batch-size', type=int, default=256)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0, help="How long to wait to fill a batch.")
+    parser.add_argument('--load-test', action='store_true',
+                        help="Start the server, run a local load test against it and exit.")
+    args = parser.parse_args()
+
+    server = start_server(args.host, args.port, args.model, args.max_batch_size, args.max_wait_ms)
+    url = f'http://{server.server_address[0]}:{server.server_address[1]}'
+    print(f"Serving model v{server.batcher.artifact['version']} at {url}")
+
+    if args.load_test:
+        run_load_test(url)
+        server.shutdown()
+    else:
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            print("\nShutting down...")
+            server.shutdown()
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.base import clone
+
+# --- Parallel cross-validation over a shared, read-only feature matrix ---
+# The feature matrix is written once to a .npy file and every worker process
+# opens it as a read-only memory map, so the pages are shared through the OS
+# page cache. Tasks only carry the (small) model and fold indices instead of
+# a pickled copy of X. Every (candidate, fold) pair is one task.
+
+_shared = {}
+
+
+class SharedMatrix:
+    """
+    X and y saved to a temporary directory for memory-mapped access by
+    worker processes. Use as a context manager to remove the files afterwards.
+    """
+
+    def __init__(self, X, y, directory=None):
+        self.directory = tempfile.mkdtemp(prefix='cv_harness_', dir=directory)
+        self.x_path = os.path.join(self.directory, 'X.npy')
+        self.y_path = os.path.join(self.directory, 'y.npy')
+        np.save(self.x_path, np.ascontiguousarray(X, dtype='float64'))
+        np.save(self.y_path, np.asarray(y, dtype='float64'))
+        self.n_rows = len(y)
+
+    def close(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _open_shared(x_path, y_path):
+    """Worker initializer: maps the shared matrix once per process."""
+    _shared['X'] = np.load(x_path, mmap_mode='r')
+    _shared['y'] = np.load(y_path, mmap_mode='r')
+
+
+def _fit_and_score(name, estimator, fold, train_index, test_index):
+    """Worker task: fits one candidate on one fold and returns its RMSE and timings."""
+    X, y = _shared['X'], _shared['y']
+    model = clone(estimator)
+
+    start_time = time.perf_counter()
+    model.fit(X[train_index], y[train_index])
+    fit_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    predictions = model.predict(X[test_index])
+    rmse = float(np.sqrt(np.mean((y[test_index] - predictions) ** 2)))
+    score_seconds = time.perf_counter() - start_time
+
+    return {'candidate': name, 'fold': fold, 'rmse': rmse,
+            'fit_seconds': fit_seconds, 'score_seconds': score_seconds}
+
+
+def cross_validate_candidates(shared, candidates, cv, workers=None):
+    """
+    Cross-validates every estimator in `candidates` (a dict of name -> estimator)
+    on the shared matrix, with all (candidate, fold) tasks spread over a
+    process pool. The folds are taken from cv.split over all rows.
+
+    Returns one row per (candidate, fold) with the RMSE and the fit/score times.
+    """
+    folds = list(cv.split(np.arange(shared.n_rows)))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_open_shared,
+                             initargs=(shared.x_path, shared.y_path)) as executor:
+        futures = [executor.submit(_fit_and_score, name, estimator, fold, train_index, test_index)
+                   for name, estimator in candidates.items()
+                   for fold, (train_index, test_index) in enumerate(folds)]
+        results = [future.result() for future in futures]
+    return pd.DataFrame(results)
+
@@ -0,0 +1,69 @@
+import numpy as np
+
+# --- Closed-form ridge regression path ---
+# One SVD of the (centered) training matrix X = U S V^T gives the ridge
+# solution for every alpha:
+#     coef(alpha) = V diag(s / (s^2 + alpha)) U^T y
+# so a grid of hundreds of alphas costs about the same as a single fit.
+# The intercept is not penalized (the data are centered first), which
+# matches sklearn's Ridge(fit_intercept=True).
+
+
+class RidgePath:
+    """Ridge fits for many alphas at once from a single SVD of the training data."""
+
+    def __init__(self, X, y):
+        X = np.asarray(X, dtype='float64')
+        y = np.asarray(y, dtype='float64')
+        self.n = len(y)
+        self.x_mean = X.mean(axis=0)
+        self.y_mean = y.mean()
+        self.U, self.s, Vt = np.linalg.svd(X - self.x_mean, full_matrices=False)
+        self.V = Vt.T
+        self.Uty = self.U.T @ (y - self.y_mean)
+        self.y = y
+
+    def _shrinkage(self, alphas):
+        """s / (s^2 + alpha) for every alpha, shape (n_alphas, n_components)."""
+        alphas = np.atleast_1d(np.asarray(alphas, dtype='float64'))[:, None]
+        return self.s / (self.s ** 2 + alphas)
+
+    def coefs(self, alphas):
+        """Coefficients for every alpha, shape (n_alphas, n_features)."""
+        return (self._shrinkage(alphas) * self.Uty) @ self.V.T
+
+    def intercepts(self, alphas):
+        return self.y_mean - self.coefs(alphas) @ self.x_mean
+
+    def predict(self, X, alphas):
+        """Predictions for every alpha, shape (n_samples, n_alphas)."""
+        Z = (np.asarray(X, dtype='float64') - self.x_mean) @ self.V
+        return self.y_mean + Z @ (self._shrinkage(alphas) * self.Uty).T
+
+    def loo_rmse(self, alphas):
+        """
+        Exact leave-one-out RMSE for every alpha, without refitting:
+        the LOO residual of row i is e_i / (1 - h_ii), where h_ii is the
+        diagonal of the hat matrix (1/n for the intercept plus the ridge part).
+        """
+        # Fraction of each component kept by the ridge fit: s^2 / (s^2 + alpha)
+        kept = self._shrinkage(alphas) * self.s
+        fitted = self.y_mean + self.U @ (kept * self.Uty).T
+        leverage = 1 / self.n + (self.U ** 2) @ kept.T
+        loo_residuals = (self.y[:, None] - fitted) / (1 - leverage)
+        return np.sqrt(np.mean(loo_residuals ** 2, axis=0))
+
+
+def cv_ridge_path(X, y, alphas, cv):
+    """
+    K-fold RMSE of ridge for every alpha, with one SVD per fold.
+    Returns an array of shape (n_folds, n_alphas).
+    """
+    X = np.asarray(X, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    fold_rmse = []
+    for train_index, test_index in cv.split(X):
+        path = RidgePath(X[train_index], y[train_index])
+        errors = y[test_index, None] - path.predict(X[test_index], alphas)
+        fold_rmse.append(np.sqrt(np.mean(errors ** 2, axis=0)))
+    return np.array(fold_rmse)
@@ -2,11 +2,14 @@ import pandas as pd
 import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
-from sklearn.model_selection import train_test_split, KFold, GridSearchCV
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+import time
+from sklearn.model_selection import train_test_split, KFold
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 
+from preprocessing import get_memory, split_feature_types, make_preprocessor, make_model_pipeline
+from warm_start_search import WarmStartCSearch
+
 # --- Step 1: Data Loading & Initial Exploration ---
 
 # Load the dataset from the Kaggle 'BankChurners.csv' file
@@ -36,33 +39,29 @@ print("-" * 40)
 
 print("\n--- Starting Data Preprocessing ---")
 
+# Keep the original data for accurate EDA (no need to read the CSV again)
+df_eda = df.copy()
+
 # Encode the Target Variable:
 # Convert the target 'Attrition_Flag' into a numerical format (0 and 1).
 df['Attrition_Flag'] = df['Attrition_Flag'].map({'Existing Customer': 0, 'Attrited Customer': 1})
 print("Encoded target variable 'Attrition_Flag'.")
 
 # Identify categorical and numerical features
-categorical_features = df.select_dtypes(include=['object']).columns
-numerical_features = df.select_dtypes(include=['int64', 'float64']).columns.drop('Attrition_Flag')
-
-# Encode Categorical Features:
-# We will use one-hot encoding for the other categorical columns.
-df = pd.get_dummies(df, columns=categorical_features, drop_first=True)
-print("Encoded categorical features using one-hot encoding.")
-
-# Feature Scaling:
-# We will scale all numerical features.
-scaler = StandardScaler()
-df[numerical_features] = scaler.fit_transform(df[numerical_features])
-print("Scaled numerical features.")
+numerical_features, categorical_features = split_feature_types(df.drop('Attrition_Flag', axis=1))
+
+# Encoding and Scaling:
+# One-hot encoding for the categorical columns and scaling for the numerical
+# ones are fitted later, on training data only (inside each CV fold when tuning).
+preprocessor = make_preprocessor(numerical_features, categorical_features)
+memory = get_memory()
+print("Defined one-hot encoding and scaling (fitted on training folds only).")
 print("-" * 40)
 
 
 # --- Step 3: Exploratory Data Analysis (EDA) ---
 
 print("\n--- Starting Exploratory Data Analysis ---")
-# Reload original data for accurate EDA before scaling/encoding
-df_eda = pd.read_csv('./data/BankChurners.csv').iloc[:, :-2]
 
 # Visualization 1: Churn Rate
 plt.figure(figsize=(8, 6))
@@ -92,8 +91,8 @@ y = df['Attrition_Flag']
 X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
 print(f"Data split into {len(X_train)} training samples and {len(X_test)} testing samples.")
 
-# Choose and train a classification model
-model = LogisticRegression(random_state=42, max_iter=1000)
+# Choose and train a classification model (preprocessing + logistic regression)
+model = make_model_pipeline(preprocessor, LogisticRegression(random_state=42, max_iter=1000), memory=memory)
 model.fit(X_train, y_train)
 print("Model training complete!")
 print("-" * 40)
@@ -132,22 +131,25 @@ plt.savefig('confusion_matrix_before_tuning.png')
 print("\n--- Starting Model Training & Hyperparameter Tuning ---")
 
 # 1. Define the model
-model_tuned = LogisticRegression(random_state=42, max_iter=1000)
+# The default 'lbfgs' solver supports warm starts ('liblinear' ignores them)
+# tol=1e-6 lets every fit converge, so the warm-started path gives the same scores as fitting each C from scratch
+model_tuned = LogisticRegression(random_state=42, max_iter=1000, tol=1e-6)
 
-# 2. Define the grid of hyperparameters to search
-param_grid = {
-    'C': [0.01, 0.1, 1, 10, 100],
-    'solver': ['liblinear'] # liblinear is good for smaller datasets and supports L1/L2
-}
+# 2. Define the values of C to search (the regularization path)
+C_values = [0.01, 0.1, 1, 10, 100]
 
 # 3. Set up K-Fold Cross-Validation
 cv = KFold(n_splits=5, shuffle=True, random_state=42)
 
-# 4. Initialize GridSearchCV
-grid_search = GridSearchCV(estimator=model_tuned, param_grid=param_grid, cv=cv, scoring='accuracy', n_jobs=-1)
+# 4. Walk the C path in each fold, warm-starting every fit from the previous C
+# The preprocessor is fitted on each training fold once and cached on disk.
+grid_search = WarmStartCSearch(estimator=model_tuned, Cs=C_values, cv=cv, scoring='accuracy',
+                               preprocessor=preprocessor, memory=memory)
 
-# 5. Fit GridSearchCV on the training data
+# 5. Fit the search on the training data
+start_time = time.perf_counter()
 grid_search.fit(X_train, y_train)
+print(f"Tuning took {time.perf_counter() - start_time:.2f} seconds.")
 
 print(f"Best Hyperparameters found: {grid_search.best_params_}")
 print(f"Best Cross-Validation Accuracy: {grid_search.best_score_ * 100:.2f}%")
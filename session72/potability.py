@@ -2,12 +2,21 @@ import pandas as pd
 import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
-from sklearn.model_selection import train_test_split, KFold, GridSearchCV
-from sklearn.preprocessing import StandardScaler
-from sklearn.impute import SimpleImputer
+import argparse
+import time
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401 (enables HalvingGridSearchCV)
+from sklearn.model_selection import train_test_split, KFold, GridSearchCV, HalvingGridSearchCV
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import classification_report, confusion_matrix
 
+from preprocessing import get_memory, make_preprocessor, make_model_pipeline
+
+parser = argparse.ArgumentParser(description="Water potability classifier with hyperparameter tuning.")
+parser.add_argument('--tuning', choices=['grid', 'halving', 'both'], default='both',
+                    help="'grid' = exhaustive GridSearchCV, 'halving' = successive halving over n_estimators, "
+                         "'both' = run both and compare (the grid result is used for the final model).")
+args = parser.parse_args()
+
 # --- Step 1: Data Loading and Initial Exploration ---
 
 try:
@@ -56,17 +65,12 @@ print("\n--- Starting Data Preprocessing ---")
 X = df.drop('Potability', axis=1)
 y = df['Potability']
 
-# Handle Missing Values: Use median imputation
-imputer = SimpleImputer(strategy='median')
-X_imputed = imputer.fit_transform(X)
-
-# Feature Scaling:
-scaler = StandardScaler()
-X_scaled = scaler.fit_transform(X_imputed)
-
-# Convert back to a DataFrame for easier use
-X = pd.DataFrame(X_scaled, columns=X.columns)
-print("Preprocessing complete! Features scaled and missing values imputed.")
+# Handle Missing Values (median imputation) and Feature Scaling:
+# Both are fitted on the training data only (inside each CV fold when
+# tuning), and the fitted transformers are cached on disk.
+preprocessor = make_preprocessor(X.columns)
+memory = get_memory()
+print("Preprocessing defined! Missing values are imputed and features scaled inside the model pipeline.")
 print("-" * 40)
 # --- Step 4: Model Training (Before Tuning) ---
 print("\n--- Starting Model Training (Before Tuning) ---")
@@ -74,7 +78,8 @@ X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_
 
 # We will use a more powerful model, RandomForestClassifier, which is better for complex problems.
 # 'class_weight="balanced"' is crucial for imbalanced datasets like this one.
-base_model = RandomForestClassifier(random_state=42, class_weight='balanced')
+base_model = make_model_pipeline(preprocessor, RandomForestClassifier(random_state=42, class_weight='balanced'),
+                                 memory=memory)
 base_model.fit(X_train, y_train)
 print("Base model training complete!")
 print("-" * 40)
@@ -103,28 +108,63 @@ print("\n--- Starting Model Training & Hyperparameter Tuning ---")
 
 # 1. Define the model
 # 'class_weight="balanced"' is crucial for imbalanced datasets like this one.
-model = RandomForestClassifier(random_state=42, class_weight='balanced')
+# The preprocessing is part of the pipeline, so it is refitted on each training fold.
+model = make_model_pipeline(preprocessor, RandomForestClassifier(random_state=42, class_weight='balanced'),
+                            memory=memory)
 
 # 2. Define the grid of hyperparameters to search
 # We'll test different numbers of trees and different tree depths.
 param_grid = {
-    'n_estimators': [100, 200],
-    'max_depth': [10, 20, None],
-    'min_samples_leaf': [1, 2, 4]
+    'model__n_estimators': [100, 200],
+    'model__max_depth': [10, 20, None],
+    'model__min_samples_leaf': [1, 2, 4]
 }
 
 # 3. Set up K-Fold Cross-Validation
 cv = KFold(n_splits=5, shuffle=True, random_state=42)
 
-# 4. Initialize GridSearchCV
+# 4. Run the search(es)
 # We will score based on 'f1_weighted' because accuracy is misleading here.
-grid_search = GridSearchCV(estimator=model, param_grid=param_grid, cv=cv, scoring='f1_weighted', n_jobs=-1)
-
-# 5. Fit GridSearchCV on the data
-grid_search.fit(X_train, y_train)
-
-print(f"Best Hyperparameters found: {grid_search.best_params_}")
-print(f"Best Cross-Validation F1-Score: {grid_search.best_score_:.4f}")
+searches = {}
+timings = {}
+
+if args.tuning in ('grid', 'both'):
+    grid_search = GridSearchCV(estimator=model, param_grid=param_grid, cv=cv, scoring='f1_weighted', n_jobs=-1)
+    start_time = time.perf_counter()
+    grid_search.fit(X_train, y_train)
+    timings['grid'] = time.perf_counter() - start_time
+    searches['grid'] = grid_search
+
+if args.tuning in ('halving', 'both'):
+    # Successive halving: every (max_depth, min_samples_leaf) candidate starts
+    # with a cheap 25-tree forest; after each round only the better half is
+    # refit with twice as many trees, up to the grid's 200.
+    halving_grid = {key: values for key, values in param_grid.items() if key != 'model__n_estimators'}
+    halving_search = HalvingGridSearchCV(estimator=model, param_grid=halving_grid, cv=cv, scoring='f1_weighted',
+                                         resource='model__n_estimators', min_resources=25, max_resources=200,
+                                         factor=2, n_jobs=-1)
+    start_time = time.perf_counter()
+    halving_search.fit(X_train, y_train)
+    timings['halving'] = time.perf_counter() - start_time
+    searches['halving'] = halving_search
+
+print("\n--- Tuning Cost Comparison ---")
+for name, search in searches.items():
+    results = search.cv_results_
+    fits = len(results['params']) * cv.get_n_splits()
+    # Trees grown is a fairer measure of cost than fits, since halving fits are mostly small forests
+    if 'n_resources' in results:
+        trees = int(np.sum(results['n_resources'])) * cv.get_n_splits()
+    else:
+        trees = sum(params['model__n_estimators'] for params in results['params']) * cv.get_n_splits()
+    print(f"{name:>8}: {timings[name]:6.2f} s, {fits} fits, {trees:,} trees, "
+          f"best CV F1 {search.best_score_:.4f}, best params {search.best_params_}")
+
+# 5. Keep the model from the selected search (the exhaustive grid when comparing both)
+best_search = searches.get('grid', searches.get('halving'))
+
+print(f"\nBest Hyperparameters found: {best_search.best_params_}")
+print(f"Best Cross-Validation F1-Score: {best_search.best_score_:.4f}")
 print("-" * 40)
 
 
@@ -133,7 +173,7 @@ print("-" * 40)
 print("\n--- Final Evaluation of the BEST Model on the Test Set (After Tuning) ---")
 
 # The best model is automatically trained and stored
-best_model = grid_search.best_estimator_
+best_model = best_search.best_estimator_
 
 # Make predictions on the unseen test set
 y_pred = best_model.predict(X_test)
@@ -0,0 +1,55 @@
+from joblib import Memory
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+# --- Shared preprocessing for the session72 projects ---
+# Imputation, encoding and scaling are steps of a scikit-learn pipeline, so
+# they are fitted on the training part of each CV fold only (fitting the
+# scaler on all rows before splitting leaks the test folds into training).
+# Fitted transformers are cached on disk with joblib.Memory, keyed by a hash
+# of the data and the transformer parameters. Grid candidates that share a
+# fold, and repeated runs of a script, reuse them instead of refitting.
+
+CACHE_DIR = 'cache'
+
+
+def get_memory(cache_dir=CACHE_DIR):
+    """joblib.Memory for the pipelines; pass cache_dir=None to disable caching."""
+    return Memory(cache_dir, verbose=0)
+
+
+def split_feature_types(X):
+    """Returns (numerical, categorical) column names of a DataFrame."""
+    numerical = list(X.select_dtypes(include='number').columns)
+    categorical = [column for column in X.columns if column not in numerical]
+    return numerical, categorical
+
+
+def make_preprocessor(numerical_features, categorical_features=(), numerical_impute='median', scale=True):
+    """
+    ColumnTransformer that imputes (median by default) and scales the
+    numerical features, and imputes the most frequent value and one-hot
+    encodes (dropping the first level) the categorical features.
+    """
+    numerical_steps = [('impute', SimpleImputer(strategy=numerical_impute))]
+    if scale:
+        numerical_steps.append(('scale', StandardScaler()))
+    transformers = [('numerical', Pipeline(numerical_steps), list(numerical_features))]
+
+    if len(categorical_features):
+        categorical_steps = Pipeline([
+            ('impute', SimpleImputer(strategy='most_frequent')),
+            ('encode', OneHotEncoder(drop='first', handle_unknown='ignore', sparse_output=False)),
+        ])
+        transformers.append(('categorical', categorical_steps, list(categorical_features)))
+    return ColumnTransformer(transformers)
+
+
+def make_model_pipeline(preprocessor, model, memory=None):
+    """
+    Pipeline of the preprocessor followed by the model. Tune the model with
+    'model__<param>' names; with memory, the fitted preprocessor is cached.
+    """
+    return Pipeline([('preprocess', preprocessor), ('model', model)], memory=memory)
@@ -2,11 +2,14 @@ import pandas as pd
 import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
-from sklearn.model_selection import train_test_split, KFold, GridSearchCV
-from sklearn.preprocessing import StandardScaler
+import time
+from sklearn.model_selection import train_test_split, KFold
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 
+from preprocessing import get_memory, make_preprocessor, make_model_pipeline
+from warm_start_search import WarmStartCSearch
+
 # --- Step 1: Data Preprocessing ---
 
 # Load the dataset from the Kaggle 'train.csv' file
@@ -23,48 +26,33 @@ print(df.isnull().sum())
 print("-" * 40)
 
 # Handle Missing Values:
-# For 'Age', fill with the median.
-median_age = df['Age'].median()
-df['Age'].fillna(median_age, inplace=True)
-
-# For 'Embarked', fill with the most common port (the mode).
-mode_embarked = df['Embarked'].mode()[0]
-df['Embarked'].fillna(mode_embarked, inplace=True)
-
+# 'Age' is filled with the median and 'Embarked' with the most common port
+# (the mode) by the preprocessor, fitted on training data only.
 # Drop 'Cabin' column due to too many missing values.
-df.drop('Cabin', axis=1, inplace=True)
-print("Preprocessing: Handled missing values for Age, Embarked, and dropped Cabin.")
+df = df.drop('Cabin', axis=1)
+print("Preprocessing: Dropped Cabin; Age and Embarked are imputed inside the model pipeline.")
 
-# Encode Categorical Variables & Feature Engineering:
+# Encode Categorical Variables & Feature Engineering (row by row, so nothing to fit):
 df['Sex'] = df['Sex'].map({'male': 0, 'female': 1})
-df = pd.get_dummies(df, columns=['Embarked'], drop_first=True)
 df['FamilySize'] = df['SibSp'] + df['Parch'] + 1
-df.drop(['PassengerId', 'Name', 'Ticket', 'SibSp', 'Parch'], axis=1, inplace=True)
-print("Preprocessing: Encoded categorical features and created 'FamilySize'.")
+df = df.drop(['PassengerId', 'Name', 'Ticket', 'SibSp', 'Parch'], axis=1)
+print("Preprocessing: Encoded 'Sex' and created 'FamilySize'.")
 
-# Define features (X) and target (y) BEFORE scaling
+# Define features (X) and target (y)
 X = df.drop('Survived', axis=1)
 y = df['Survived']
-# Save column names before scaling (as scaler returns a numpy array)
-feature_names = X.columns
-
-# Feature Scaling:
-scaler = StandardScaler()
-X_scaled = scaler.fit_transform(X)
-X = pd.DataFrame(X_scaled, columns=feature_names) # Convert back to DataFrame
-print("Preprocessing: Scaled all numerical features.")
+
+# Imputation, one-hot encoding of 'Embarked' and Feature Scaling are fitted
+# later on the training data (inside each CV fold when tuning) and cached on disk.
+preprocessor = make_preprocessor([column for column in X.columns if column != 'Embarked'], ['Embarked'])
+memory = get_memory()
+print("Preprocessing: Defined imputation, encoding and scaling.")
 print("-" * 40)
 
 
 # --- Step 2: Exploratory Data Analysis (EDA) ---
 
 print("\n--- Starting Exploratory Data Analysis ---")
-# For EDA, we'll use the preprocessed but unscaled data for easier interpretation
-# We need to recreate the unscaled feature DataFrame for this
-df_unscaled = df.drop('Survived', axis=1)
-df_eda = df_unscaled.copy()
-df_eda['Survived'] = y
-
 
 # Visualization 1: Survival Rate by Gender
 plt.figure(figsize=(8, 6))
@@ -93,7 +81,7 @@ print("-" * 40)
 
 # --- Step 4: Model Training (Before Tuning) ---
 print("\n--- Starting Model Training (Before Tuning) ---")
-base_model = LogisticRegression(random_state=42, max_iter=1000)
+base_model = make_model_pipeline(preprocessor, LogisticRegression(random_state=42, max_iter=1000), memory=memory)
 base_model.fit(X_train, y_train)
 print("Base model training complete!")
 
@@ -121,22 +109,25 @@ print("-" * 40)
 print("\n--- Starting Model Training & Hyperparameter Tuning ---")
 
 # Choose the model
-model = LogisticRegression(random_state=42, max_iter=1000)
+# A tight tol so the warm-started search scores each C as a cold grid search would
+model = LogisticRegression(random_state=42, max_iter=1000, tol=1e-6)
 
-# Define the grid of hyperparameters to search
-param_grid = {
-    'C': [0.01, 0.1, 1, 10, 100] # C is the regularization strength
-}
+# Define the values of C to search
+C_values = [0.01, 0.1, 1, 10, 100] # C is the inverse regularization strength
 
 # Set up K-Fold Cross-Validation
 cv = KFold(n_splits=5, shuffle=True, random_state=42)
 
-# Initialize GridSearchCV
-# This will search for the best 'C' value using 5-fold cross-validation.
-grid_search = GridSearchCV(estimator=model, param_grid=param_grid, cv=cv, scoring='accuracy')
+# Initialize the warm-start search
+# This finds the best 'C' value using 5-fold cross-validation, fitting the C
+# values in order so each fit starts from the previous solution.
+grid_search = WarmStartCSearch(estimator=model, Cs=C_values, cv=cv, scoring='accuracy',
+                               preprocessor=preprocessor, memory=memory)
 
-# Fit GridSearchCV on the TRAINING data
+# Fit the search on the TRAINING data
+start_time = time.perf_counter()
 grid_search.fit(X_train, y_train)
+print(f"Tuning took {time.perf_counter() - start_time:.2f} seconds.")
 
 print(f"Best Hyperparameters found: {grid_search.best_params_}")
 print(f"Best Cross-Validation Accuracy: {grid_search.best_score_ * 100:.2f}%")
@@ -0,0 +1,127 @@
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.pipeline import Pipeline
+from sklearn.utils.validation import check_memory
+
+# --- Warm-start search over the regularization path ---
+# GridSearchCV fits every C from scratch in every fold. Here each fold is
+# sliced (and preprocessed) once, and the C values are fitted in increasing
+# order with warm_start=True. Each fit then starts from the previous, more
+# regularized solution and only needs a few solver iterations.
+
+
+def _rows(data, index):
+    return data.iloc[index] if hasattr(data, 'iloc') else data[index]
+
+
+def _transform_fold(preprocessor, X_train, y_train, X_test):
+    """Fits the preprocessor on the training part of a fold and transforms both parts."""
+    preprocessor = clone(preprocessor)
+    return preprocessor.fit_transform(X_train, y_train), preprocessor.transform(X_test)
+
+
+def _fold_path(estimator, preprocessor, memory, X, y, train_index, test_index, Cs, scorer):
+    """Fits the whole C path on one fold and returns the test score for each C."""
+    X_train, X_test = _rows(X, train_index), _rows(X, test_index)
+    y_train, y_test = y[train_index], y[test_index]
+    if preprocessor is not None:
+        # Fitted on the training part of the fold only, then reused for every C
+        X_train, X_test = memory.cache(_transform_fold)(preprocessor, X_train, y_train, X_test)
+
+    model = clone(estimator).set_params(warm_start=True)
+    scores = []
+    for C in Cs:
+        model.set_params(C=C)
+        model.fit(X_train, y_train)
+        scores.append(scorer(model, X_test, y_test))
+    return scores
+
+
+class WarmStartCSearch:
+    """
+    Cross-validated search for C of a linear model with warm_start support
+    (e.g. LogisticRegression with the default 'lbfgs' solver; 'liblinear'
+    ignores warm starts).
+
+    Has the same attributes as GridSearchCV for a grid over C:
+    best_params_, best_score_, best_estimator_ and cv_results_.
+    An optional preprocessor (e.g. StandardScaler()) is fitted inside each
+    fold; with memory (a joblib.Memory or cache directory) the transformed
+    folds are cached on disk.
+
+    A warm-started fit stops at a different point than a cold one unless
+    the solver converges, so give the estimator a tight tol (1e-6 for
+    lbfgs; the default 1e-4 can change which C wins). Then the scores are
+    those of GridSearchCV over make_pipeline(preprocessor, estimator):
+
+    >>> from sklearn.datasets import make_classification
+    >>> from sklearn.linear_model import LogisticRegression
+    >>> from sklearn.model_selection import GridSearchCV, KFold
+    >>> from sklearn.pipeline import make_pipeline
+    >>> from sklearn.preprocessing import StandardScaler
+    >>> X, y = make_classification(n_samples=300, n_features=30, n_informative=5, random_state=3)
+    >>> model, Cs = LogisticRegression(tol=1e-6, max_iter=1000), [0.01, 0.1, 1, 10, 100]
+    >>> cv = KFold(n_splits=5, shuffle=True, random_state=0)
+    >>> warm = WarmStartCSearch(model, Cs, cv, preprocessor=StandardScaler()).fit(X, y)
+    >>> cold = GridSearchCV(make_pipeline(StandardScaler(), model), {'logisticregression__C': Cs}, cv=cv).fit(X, y)
+    >>> warm.best_params_['C'] == cold.best_params_['logisticregression__C'], float(warm.best_score_ - cold.best_score_)
+    (True, 0.0)
+    >>> bool((warm.cv_results_['mean_test_score'] == cold.cv_results_['mean_test_score']).all())
+    True
+    """
+
+    def __init__(self, estimator, Cs, cv, scoring='accuracy', preprocessor=None, memory=None, n_jobs=None,
+                 refit=True):
+        self.estimator = estimator
+        self.Cs = Cs
+        self.cv = cv
+        self.scoring = scoring
+        self.preprocessor = preprocessor
+        self.memory = memory
+        self.n_jobs = n_jobs
+        self.refit = refit
+
+    def fit(self, X, y):
+        X_input, y_input = X, y
+        if self.preprocessor is None:
+            X = np.asarray(X, dtype='float64')
+        y = np.asarray(y)
+        memory = check_memory(self.memory)
+        # Strongest regularization first, so every fit warm-starts from a nearby solution
+        Cs = sorted(self.Cs)
+        scorer = get_scorer(self.scoring)
+
+        fold_scores = Parallel(n_jobs=self.n_jobs)(
+            delayed(_fold_path)(self.estimator, self.preprocessor, memory, X, y, train_index, test_index, Cs, scorer)
+            for train_index, test_index in self.cv.split(X, y))
+        fold_scores = np.array(fold_scores)  # shape (n_folds, n_Cs)
+
+        mean_scores = fold_scores.mean(axis=0)
+        self.cv_results_ = {
+            'param_C': np.array(Cs),
+            'params': [{'C': C} for C in Cs],
+            'mean_test_score': mean_scores,
+            'std_test_score': fold_scores.std(axis=0),
+        }
+        for i, scores in enumerate(fold_scores):
+            self.cv_results_[f'split{i}_test_score'] = scores
+
+        # Ties go to the smaller C, like GridSearchCV with an ascending grid
+        best = int(np.argmax(mean_scores))
+        self.best_index_ = best
+        self.best_params_ = {'C': Cs[best]}
+        self.best_score_ = float(mean_scores[best])
+
+        if self.refit:
+            # Refit on the data as given, so the model keeps any DataFrame feature names.
+            # With a preprocessor, best_estimator_ is a Pipeline that takes raw features.
+            model = clone(self.estimator).set_params(C=Cs[best])
+            if self.preprocessor is not None:
+                model = Pipeline([('preprocess', clone(self.preprocessor)), ('model', model)], memory=memory)
+            self.best_estimator_ = model.fit(X_input, y_input)
+        return self
+
+    def predict(self, X):
+        return self.best_estimator_.predict(X)
@@ -1,54 +1,236 @@
 import tensorflow as tf
-from tensorflow.keras import layers, models
+import argparse
+import os
+import time
+from tensorflow.keras import layers, models, callbacks
 from tensorflow.keras.datasets import mnist
 from tensorflow.keras.utils import to_categorical
 
-# Load MNIST dataset
-(x_train, y_train), (x_test, y_test) = mnist.load_data()
-
-# Normalize pixel values to be between 0 and 1
-x_train = x_train.astype('float32') / 255.0
-x_test = x_test.astype('float32') / 255.0
-
-# Flatten images to 1D vectors of size 784 (28*28)
-x_train = x_train.reshape(-1, 28 * 28)
-x_test = x_test.reshape(-1, 28 * 28)
-
-# One-hot encode the labels (e.g., 5 -> [0,0,0,0,0,1,0,0,0,0])
-y_train = to_categorical(y_train, 10)
-y_test = to_categorical(y_test, 10)
-
-# Build the model layer by layer
-model = models.Sequential([
-    # Input Layer + First Hidden Layer: 128 neurons, using ReLU activation
-    layers.Dense(128, activation='relu', input_shape=(784,)),
-    
-    # Second Hidden Layer: 64 neurons, also using ReLU
-    layers.Dense(64, activation='relu'),
-    
-    # Output Layer: 10 neurons (one for each digit 0-9)
-    # Softmax activation gives us the probability for each class.
-    layers.Dense(10, activation='softmax')
-])
-
-# Print a summary of our model's architecture
-model.summary()
-
-# Compile the model with its learning instructions
-model.compile(
-    optimizer='adam',                      # The algorithm to use for backpropagation
-    loss='categorical_crossentropy',       # The function to measure the model's error
-    metrics=['accuracy']                   # The metric we want to track
-)
-
-# Train the model!
-# An "epoch" is one full pass through the entire training dataset.
-print("\nStarting model training...")
-history = model.fit(
-    x_train, 
-    y_train, 
-    epochs=10, 
-    batch_size=32, 
-    validation_split=0.1 # Use 10% of training data for validation
-)
-print("Model training complete!")
+# Same split as validation_split=0.1: the last 10% of the training images
+VALIDATION_FRACTION = 0.1
+
+EXPORT_DIR = 'export'
+CHECKPOINT_DIR = 'checkpoints'
+
+
+def load_array_data():
+    """The original preprocessing: float32 flattened images and one-hot labels, all in memory."""
+    # Load MNIST dataset
+    (x_train, y_train), (x_test, y_test) = mnist.load_data()
+
+    # Normalize pixel values to be between 0 and 1
+    x_train = x_train.astype('float32') / 255.0
+    x_test = x_test.astype('float32') / 255.0
+
+    # Flatten images to 1D vectors of size 784 (28*28)
+    x_train = x_train.reshape(-1, 28 * 28)
+    x_test = x_test.reshape(-1, 28 * 28)
+
+    # One-hot encode the labels (e.g., 5 -> [0,0,0,0,0,1,0,0,0,0])
+    y_train = to_categorical(y_train, 10)
+    y_test = to_categorical(y_test, 10)
+    return (x_train, y_train), (x_test, y_test)
+
+
+def normalize(images, labels):
+    """Runs inside the tf.data pipeline, one batch at a time: uint8 28x28 -> float32 784 in [0, 1]."""
+    images = tf.reshape(tf.cast(images, tf.float32) / 255.0, (-1, 28 * 28))
+    return images, labels
+
+
+def make_dataset(images, labels, batch_size, shuffle=False):
+    """
+    tf.data pipeline over uint8 images and integer labels. The raw uint8
+    data are cached (4x smaller than float32), batches are normalized on the
+    fly, and the next batches are prepared while the model trains.
+    """
+    dataset = tf.data.Dataset.from_tensor_slices((images, labels)).cache()
+    if shuffle:
+        dataset = dataset.shuffle(len(images), seed=42, reshuffle_each_iteration=True)
+    # Batch first, so normalize runs once per batch instead of once per image
+    dataset = dataset.batch(batch_size).map(normalize, num_parallel_calls=tf.data.AUTOTUNE)
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+def load_datasets(batch_size):
+    """Train, validation and test pipelines with uint8 images and sparse integer labels."""
+    (x_train, y_train), (x_test, y_test) = mnist.load_data()
+    n_validation = int(len(x_train) * VALIDATION_FRACTION)
+    x_train, x_val = x_train[:-n_validation], x_train[-n_validation:]
+    y_train, y_val = y_train[:-n_validation], y_train[-n_validation:]
+    return (make_dataset(x_train, y_train, batch_size, shuffle=True),
+            make_dataset(x_val, y_val, batch_size),
+            make_dataset(x_test, y_test, batch_size),
+            len(x_train))
+
+
+def build_model(sparse_labels=False):
+    """The 784-128-64-10 network, compiled for one-hot or sparse integer labels."""
+    # Build the model layer by layer
+    model = models.Sequential([
+        # Input Layer + First Hidden Layer: 128 neurons, using ReLU activation
+        layers.Dense(128, activation='relu', input_shape=(784,)),
+
+        # Second Hidden Layer: 64 neurons, also using ReLU
+        layers.Dense(64, activation='relu'),
+
+        # Output Layer: 10 neurons (one for each digit 0-9)
+        # Softmax activation gives us the probability for each class.
+        layers.Dense(10, activation='softmax')
+    ])
+
+    # Compile the model with its learning instructions
+    model.compile(
+        optimizer='adam',                      # The algorithm to use for backpropagation
+        # The function to measure the model's error (the sparse version takes digit labels directly)
+        loss='sparse_categorical_crossentropy' if sparse_labels else 'categorical_crossentropy',
+        metrics=['accuracy']                   # The metric we want to track
+    )
+    return model
+
+
+class ThroughputLogger(callbacks.Callback):
+    """
+    Prints the wall time and training samples/sec of every epoch, and adds
+    them to the epoch logs (as 'epoch_seconds' and 'samples_per_sec') so a
+    CSVLogger placed after this callback records them too.
+    """
+
+    def __init__(self, n_samples):
+        super().__init__()
+        self.n_samples = n_samples
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.epoch_start = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        seconds = time.perf_counter() - self.epoch_start
+        print(f"Epoch {epoch + 1}: {seconds:.2f} s, {self.n_samples / seconds:,.0f} samples/sec")
+        if logs is not None:
+            logs['epoch_seconds'] = seconds
+            logs['samples_per_sec'] = self.n_samples / seconds
+
+
+def run_name(pipeline, batch_size, epochs, early_stopping=False, patience=3):
+    """Name of a training configuration, e.g. 'tfdata_bs256_ep10' or 'arrays_bs32_ep20_es3'."""
+    name = f"{pipeline}_bs{batch_size}_ep{epochs}"
+    return f"{name}_es{patience}" if early_stopping else name
+
+
+def training_callbacks(n_train, run, early_stopping=False, patience=3, checkpoint_dir=CHECKPOINT_DIR):
+    """
+    Callbacks for model.fit. Each configuration gets its own directory,
+    <checkpoint_dir>/<run> (see run_name), so the logs of different
+    configurations can be compared side by side. Always: the throughput
+    logger, plus a per-epoch CSV log (loss, accuracy, epoch seconds,
+    samples/sec) in <run dir>/training_log.csv. A new run overwrites the
+    log; a resumed run appends to it.
+
+    With early_stopping: training stops once val_loss has not improved for
+    `patience` epochs and the best weights are restored, the best model is
+    saved to <run dir>/best.keras, and the full training state is backed up
+    every epoch. A killed run started again with the same configuration
+    resumes from its last completed epoch (the early-stopping patience
+    count starts again from zero after a resume).
+    """
+    run_dir = os.path.join(checkpoint_dir, run)
+    backup_dir = os.path.join(run_dir, 'backup')
+    # BackupAndRestore deletes its backup when training finishes, so one left behind means a resume
+    resuming = early_stopping and os.path.exists(backup_dir)
+    os.makedirs(run_dir, exist_ok=True)
+    callback_list = [
+        ThroughputLogger(n_train),
+        callbacks.CSVLogger(os.path.join(run_dir, 'training_log.csv'), append=resuming),
+    ]
+    if early_stopping:
+        callback_list += [
+            callbacks.EarlyStopping(monitor='val_loss', patience=patience, restore_best_weights=True, verbose=1),
+            callbacks.ModelCheckpoint(os.path.join(run_dir, 'best.keras'), monitor='val_loss',
+                                      save_best_only=True),
+            # Saves weights, optimizer state and epoch; deleted when training finishes normally
+            callbacks.BackupAndRestore(backup_dir),
+        ]
+    return callback_list
+
+
+def export_model(model, export_dir=EXPORT_DIR, quantize=False):
+    """
+    Writes the trained network for inference only:
+      <export_dir>/saved_model  - SavedModel with a fixed 'serving_default'
+                                  signature (float32 [batch, 784] -> probabilities)
+      <export_dir>/model.tflite - TFLite flatbuffer converted from it (with
+                                  quantize=True, weights are stored as int8)
+    Returns the two paths.
+    """
+    @tf.function(input_signature=[tf.TensorSpec([None, 28 * 28], tf.float32, name='images')])
+    def serve(images):
+        return {'probabilities': model(images, training=False)}
+
+    # Wrap the model in a plain tf.Module so only the inference graph is saved
+    module = tf.Module()
+    module.model = model
+    module.serve = serve
+    saved_model_dir = os.path.join(export_dir, 'saved_model')
+    tf.saved_model.save(module, saved_model_dir, signatures={'serving_default': serve})
+
+    converter = tf.lite.TFLiteConverter.from_saved_model(saved_model_dir)
+    if quantize:
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    tflite_path = os.path.join(export_dir, 'model.tflite')
+    with open(tflite_path, 'wb') as f:
+        f.write(converter.convert())
+    return saved_model_dir, tflite_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the MNIST ANN.")
+    parser.add_argument('--pipeline', choices=['arrays', 'tfdata'], default='tfdata',
+                        help="'arrays' = original float32/one-hot arrays, 'tfdata' = uint8 tf.data pipeline.")
+    parser.add_argument('--batch-size', type=int, default=None,
+                        help="Batch size (default: 32 for arrays, 256 for tfdata).")
+    parser.add_argument('--epochs', type=int, default=10, help="Number of epochs (the maximum with early stopping).")
+    parser.add_argument('--early-stopping', action='store_true',
+                        help="Stop when val_loss stops improving, keep the best weights, checkpoint and resume.")
+    parser.add_argument('--patience', type=int, default=3, help="Epochs without val_loss improvement before stopping.")
+    parser.add_argument('--checkpoint-dir', default=CHECKPOINT_DIR,
+                        help="Gets one subdirectory per configuration, with its checkpoints and per-epoch CSV log.")
+    parser.add_argument('--export-dir', default=EXPORT_DIR, help="Where to write the SavedModel and TFLite model.")
+    parser.add_argument('--quantize', action='store_true', help="Store the TFLite weights as int8.")
+    args = parser.parse_args()
+
+    batch_size = args.batch_size or (32 if args.pipeline == 'arrays' else 256)
+    run = run_name(args.pipeline, batch_size, args.epochs, args.early_stopping, args.patience)
+    print(f"Run '{run}': logs and checkpoints in '{os.path.join(args.checkpoint_dir, run)}'.")
+
+    model = build_model(sparse_labels=(args.pipeline == 'tfdata'))
+
+    # Print a summary of our model's architecture
+    model.summary()
+
+    # Train the model!
+    # An "epoch" is one full pass through the entire training dataset.
+    print("\nStarting model training...")
+    if args.pipeline == 'arrays':
+        (x_train, y_train), (x_test, y_test) = load_array_data()
+        n_train = len(x_train) - int(len(x_train) * VALIDATION_FRACTION)
+        history = model.fit(
+            x_train,
+            y_train,
+            epochs=args.epochs,
+            batch_size=batch_size,
+            validation_split=VALIDATION_FRACTION, # Use 10% of training data for validation
+            callbacks=training_callbacks(n_train, run, args.early_stopping, args.patience, args.checkpoint_dir)
+        )
+    else:
+        train_data, val_data, test_data, n_train = load_datasets(batch_size)
+        history = model.fit(
+            train_data,
+            epochs=args.epochs,
+            validation_data=val_data,
+            callbacks=training_callbacks(n_train, run, args.early_stopping, args.patience, args.checkpoint_dir)
+        )
+    print("Model training complete!")
+
+    saved_model_dir, tflite_path = export_model(model, args.export_dir, quantize=args.quantize)
+    print(f"Exported SavedModel to '{saved_model_dir}' and TFLite model to '{tflite_path}'.")
+    print("Run benchmark.py to measure their latency and throughput.")
@@ -0,0 +1,107 @@
+import numpy as np
+import tensorflow as tf
+import argparse
+import os
+import time
+from tensorflow.keras.datasets import mnist
+
+from ann import EXPORT_DIR
+
+# --- CPU latency / throughput benchmark for the exported MNIST model ---
+# Times the SavedModel signature and the TFLite interpreter on real test
+# images at batch sizes 1, 2, 4, ... 1024. Batch size 1 gives the
+# single-request latency; the larger sizes show how much batching buys.
+
+BATCH_SIZES = [2 ** i for i in range(11)]
+
+
+def load_test_images():
+    """MNIST test images, preprocessed like the training pipeline (float32, 784, [0, 1])."""
+    (_, _), (x_test, _) = mnist.load_data()
+    return (x_test.reshape(-1, 28 * 28) / 255.0).astype('float32')
+
+
+def saved_model_runner(saved_model_dir):
+    """Returns a function batch -> probabilities using the SavedModel's serving signature."""
+    serve = tf.saved_model.load(saved_model_dir).signatures['serving_default']
+    return lambda batch: serve(images=tf.constant(batch))['probabilities'].numpy()
+
+
+def tflite_runner(tflite_path, num_threads=None):
+    """Returns a function batch -> probabilities using the TFLite interpreter."""
+    interpreter = tf.lite.Interpreter(model_path=tflite_path, num_threads=num_threads)
+    input_index = interpreter.get_input_details()[0]['index']
+    output_index = interpreter.get_output_details()[0]['index']
+    current_size = None
+
+    def run(batch):
+        nonlocal current_size
+        # Resizing re-plans the tensors, so only do it when the batch size changes
+        if current_size != len(batch):
+            interpreter.resize_tensor_input(input_index, [len(batch), 28 * 28])
+            interpreter.allocate_tensors()
+            current_size = len(batch)
+        interpreter.set_tensor(input_index, batch)
+        interpreter.invoke()
+        return interpreter.get_tensor(output_index)
+
+    return run
+
+
+def benchmark(run, images, batch_sizes=BATCH_SIZES, min_seconds=1.0, warmup=3):
+    """
+    Times run(batch) at each batch size until at least min_seconds have
+    passed. Returns one dict per batch size with the median and p99 latency
+    per batch (ms) and the throughput (samples/sec).
+    """
+    results = []
+    for batch_size in batch_sizes:
+        batch = images[:batch_size]
+        for _ in range(warmup):
+            run(batch)
+
+        latencies = []
+        start_time = time.perf_counter()
+        while time.perf_counter() - start_time < min_seconds or len(latencies) < 10:
+            call_start = time.perf_counter()
+            run(batch)
+            latencies.append(time.perf_counter() - call_start)
+
+        latencies = np.array(latencies) * 1000
+        results.append({
+            'batch_size': batch_size,
+            'p50_ms': float(np.percentile(latencies, 50)),
+            'p99_ms': float(np.percentile(latencies, 99)),
+            'samples_per_sec': batch_size * len(latencies) / (latencies.sum() / 1000),
+        })
+    return results
+
+
+def print_results(name, results):
+    print(f"\n--- {name} ---")
+    print(f"{'batch':>6} {'p50 ms':>10} {'p99 ms':>10} {'samples/sec':>14}")
+    for row in results:
+        print(f"{row['batch_size']:>6} {row['p50_ms']:>10.3f} {row['p99_ms']:>10.3f} {row['samples_per_sec']:>14,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the exported MNIST model on CPU.")
+    parser.add_argument('--export-dir', default=EXPORT_DIR, help="Directory written by ann.py.")
+    parser.add_argument('--seconds', type=float, default=1.0, help="Minimum timing per batch size.")
+    parser.add_argument('--threads', type=int, default=None, help="TFLite interpreter threads.")
+    args = parser.parse_args()
+
+    images = load_test_images()
+    runners = {
+        'SavedModel': saved_model_runner(os.path.join(args.export_dir, 'saved_model')),
+        'TFLite': tflite_runner(os.path.join(args.export_dir, 'model.tflite'), args.threads),
+    }
+
+    # Both artifacts should agree before their speed is compared
+    reference = runners['SavedModel'](images[:256])
+    for name, run in runners.items():
+        max_difference = np.abs(run(images[:256]) - reference).max()
+        print(f"{name}: max difference from SavedModel on 256 images = {max_difference:.2e}")
+
+    for name, run in runners.items():
+        print_results(name, benchmark(run, images, min_seconds=args.seconds))